@@ -0,0 +1,345 @@
+from .control_flow_graph import ControlFlowGraph
+from .opcodes import FUSED_BRANCHES
+from .quadruple_editor import QuadrupleEditor
+
+# Relational operation that is true when another one is false
+NEGATED_RELATIONS = {
+    '>' : '<=',
+    '<' : '>=',
+    '>=' : '<',
+    '<=' : '>',
+    '==' : '!=',
+    '!=' : '=='
+}
+
+# Relational operation whose result is the same with the operands swapped
+SWAPPED_RELATIONS = {
+    '>' : '<',
+    '<' : '>',
+    '>=' : '<=',
+    '<=' : '>=',
+    '==' : '==',
+    '!=' : '!='
+}
+
+# Relational operation each fused conditional jump compares
+FUSED_RELATIONS = {jump : relational for relational, jump in FUSED_BRANCHES.items()}
+
+# Interval of a variable nothing is known about, None is an unbounded end
+UNBOUNDED = (None, None)
+
+class BoundsCheckEliminator():
+    """Removes the index verifications of dimensioned variables whose index is
+    always inside the limits. The values every integer local and temporal
+    variable may hold are tracked as intervals through the blocks of each
+    function, narrowed by the conditional jumps and the verifications that
+    remain"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.function_directory = program.function_directory
+
+    def is_integer_variable(self, address):
+        """Checks if an address is an integer local or temporal variable, the
+        functions called can't change them"""
+        for memory_segment in [self.memory.local_memory, self.memory.temporal_memory]:
+            if memory_segment.contains(address):
+                return memory_segment.determines_segment_tpye(address) == 'int'
+        return False
+
+    def optimize(self):
+        """Removes the verifications that never fail in every function, returns
+        the number of verifications removed"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        function_list = self.function_directory.function_list
+
+        removed_verifications = 0
+        for function_name, start, end in editor.get_function_quadruples():
+            removed_verifications += self.eliminate_function_checks(function_list[function_name],
+                quadruple_list[start:end], editor)
+
+        editor.close()
+        return removed_verifications
+
+    def get_entry_intervals(self, function):
+        """Returns the intervals of the variables when a function starts, every
+        variable except the parameters starts with 0"""
+        intervals = {}
+        for memory_segment, counter_name in [(self.memory.local_memory, 'number_of_local_variables'),
+                (self.memory.temporal_memory, 'number_of_temporal_variables')]:
+            for position in range(function[counter_name]['int']):
+                intervals[memory_segment.int_initial_address + position] = (0, 0)
+        for address in function['parameters']['addresses']:
+            intervals.pop(address, None)
+        return intervals
+
+    def eliminate_function_checks(self, function, quadruples, editor):
+        """Removes the verifications of a function that never fail, returns the
+        number of verifications removed"""
+        control_flow_graph = ControlFlowGraph(quadruples)
+        block_intervals = self.compute_intervals(control_flow_graph,
+            self.get_entry_intervals(function))
+
+        removed_verifications = 0
+        for block_number, block in enumerate(control_flow_graph.blocks):
+            intervals = block_intervals[block_number]
+            if intervals is None:
+                continue
+            intervals = dict(intervals)
+            for quadruple in block:
+                if quadruple.operator == 'VERF_INDEX' and self.is_inside(
+                        self.get_interval(quadruple.left_operand, intervals),
+                        self.get_index_interval(quadruple)):
+                    editor.remove(quadruple)
+                    removed_verifications += 1
+                self.apply_quadruple(quadruple, intervals)
+        return removed_verifications
+
+    def compute_intervals(self, control_flow_graph, entry_intervals):
+        """Returns the intervals of the variables at the start of every block,
+        None for the blocks the execution never reaches. A block a later block
+        jumps back to widens the ends that keep growing to unbounded ones, so
+        the loops are solved in a few iterations"""
+        order = control_flow_graph.get_reverse_postorder()
+        order_positions = {block_number : position for position, block_number in enumerate(order)}
+        widened_blocks = set(successor for block_number in order
+            for successor in control_flow_graph.successors[block_number]
+            if order_positions.get(successor, -1) <= order_positions[block_number])
+
+        block_intervals = [None] * len(control_flow_graph.blocks)
+        edge_intervals = {}
+        pending_blocks = set(order[:1])
+        while pending_blocks:
+            block_number = min(pending_blocks, key=lambda pending_block: order_positions[pending_block])
+            pending_blocks.discard(block_number)
+
+            incoming_intervals = [edge_intervals.get((predecessor, block_number))
+                for predecessor in control_flow_graph.predecessors[block_number]]
+            if block_number == 0:
+                incoming_intervals.append(entry_intervals)
+            intervals = self.join_intervals(incoming_intervals)
+            if intervals is None:
+                continue
+            if block_number in widened_blocks and block_intervals[block_number] is not None:
+                intervals = self.widen_intervals(block_intervals[block_number], intervals)
+            if intervals == block_intervals[block_number]:
+                continue
+            block_intervals[block_number] = intervals
+
+            # The intervals after the block reach its successors, narrowed by
+            # the condition of the jump that leads to each one
+            out_intervals = dict(intervals)
+            for quadruple in control_flow_graph.blocks[block_number]:
+                self.apply_quadruple(quadruple, out_intervals)
+            for successor, successor_intervals in self.get_successor_intervals(control_flow_graph,
+                    block_number, out_intervals):
+                if edge_intervals.get((block_number, successor)) != successor_intervals:
+                    edge_intervals[(block_number, successor)] = successor_intervals
+                    pending_blocks.add(successor)
+
+        return block_intervals
+
+    def get_successor_intervals(self, control_flow_graph, block_number, intervals):
+        """Returns every successor of a block with the intervals the execution
+        reaches it with, None when the jump to it can't happen"""
+        block = control_flow_graph.blocks[block_number]
+        successors = control_flow_graph.successors[block_number]
+        condition = self.get_jump_condition(block)
+        if condition is None or len(successors) != 2:
+            return [(successor, intervals) for successor in successors]
+
+        relation, left_operand, right_operand = condition
+        jump_block = control_flow_graph.get_block_number(block[-1].result)
+        successor_intervals = []
+        for successor in successors:
+            if successor == jump_block:
+                successor_intervals.append((successor, self.narrow_intervals(intervals,
+                    relation, left_operand, right_operand)))
+            else:
+                successor_intervals.append((successor, self.narrow_intervals(intervals,
+                    NEGATED_RELATIONS[relation], left_operand, right_operand)))
+        return successor_intervals
+
+    def get_jump_condition(self, block):
+        """Returns the relational operation and the operands that make the
+        conditional jump at the end of a block jump, None when it is unknown.
+        The relational operation that writes the operand of a GOTOF or a GOTOT
+        is searched in the block, following the copies of its result"""
+        jump = block[-1]
+        if jump.operator in FUSED_RELATIONS:
+            return (NEGATED_RELATIONS[FUSED_RELATIONS[jump.operator]], jump.left_operand,
+                jump.right_operand)
+        elif jump.operator != 'GOTOF' and jump.operator != 'GOTOT':
+            return None
+
+        condition_address = jump.left_operand
+        later_stores = set()
+        for quadruple in reversed(block[:-1]):
+            stored_address = quadruple.get_stored_address()
+            if stored_address == condition_address:
+                if quadruple.operator == '=' and not isinstance(quadruple.left_operand, dict):
+                    condition_address = quadruple.left_operand
+                elif (quadruple.operator in NEGATED_RELATIONS
+                        and later_stores.isdisjoint(quadruple.get_used_addresses())):
+                    if jump.operator == 'GOTOF':
+                        return (NEGATED_RELATIONS[quadruple.operator], quadruple.left_operand,
+                            quadruple.right_operand)
+                    else:
+                        return (quadruple.operator, quadruple.left_operand,
+                            quadruple.right_operand)
+                else:
+                    return None
+            if stored_address is not None:
+                later_stores.add(stored_address)
+        return None
+
+    def narrow_intervals(self, intervals, relation, left_operand, right_operand):
+        """Returns the intervals the variables have when a relational operation
+        is true, None when it can never be true"""
+        if relation == '>' or relation == '>=':
+            relation = SWAPPED_RELATIONS[relation]
+            left_operand, right_operand = right_operand, left_operand
+        left_low, left_high = self.get_interval(left_operand, intervals)
+        right_low, right_high = self.get_interval(right_operand, intervals)
+
+        if relation == '<':
+            new_left = (None, self.add_bounds(right_high, -1))
+            new_right = (self.add_bounds(left_low, 1), None)
+        elif relation == '<=':
+            new_left = (None, right_high)
+            new_right = (left_low, None)
+        elif relation == '==':
+            new_left = (right_low, right_high)
+            new_right = (left_low, left_high)
+        else:
+            return intervals
+
+        new_left = self.intersect_intervals((left_low, left_high), new_left)
+        new_right = self.intersect_intervals((right_low, right_high), new_right)
+        if new_left is None or new_right is None:
+            return None
+
+        narrowed_intervals = dict(intervals)
+        if self.is_integer_variable(left_operand):
+            narrowed_intervals[left_operand] = new_left
+        if self.is_integer_variable(right_operand):
+            narrowed_intervals[right_operand] = new_right
+        return narrowed_intervals
+
+    def get_index_interval(self, quadruple):
+        """Returns the interval of the indexes a verification accepts"""
+        return (quadruple.right_operand, quadruple.result - 1)
+
+    def get_interval(self, operand, intervals):
+        """Returns the interval of the values an operand may hold"""
+        if self.memory.constant_memory.contains(operand):
+            value = self.memory.get_value(operand)
+            if isinstance(value, int) and not isinstance(value, bool):
+                return (value, value)
+            return UNBOUNDED
+        elif isinstance(operand, dict):
+            return UNBOUNDED
+        return intervals.get(operand, UNBOUNDED)
+
+    def apply_quadruple(self, quadruple, intervals):
+        """Updates the intervals with the value a quadruple writes"""
+        if quadruple.operator == 'VERF_INDEX':
+            # The program stops when the verification fails
+            if self.is_integer_variable(quadruple.left_operand):
+                index_interval = self.intersect_intervals(self.get_interval(
+                    quadruple.left_operand, intervals), self.get_index_interval(quadruple))
+                if index_interval is not None:
+                    intervals[quadruple.left_operand] = index_interval
+            return
+
+        stored_address = quadruple.get_stored_address()
+        if not self.is_integer_variable(stored_address):
+            return
+        left_interval = self.get_interval(quadruple.left_operand, intervals)
+        right_interval = self.get_interval(quadruple.right_operand, intervals)
+        if quadruple.operator == '=':
+            interval = left_interval
+        elif quadruple.operator == '+':
+            interval = (self.add_bounds(left_interval[0], right_interval[0]),
+                self.add_bounds(left_interval[1], right_interval[1]))
+        elif quadruple.operator == '-':
+            interval = (self.subtract_bounds(left_interval[0], right_interval[1]),
+                self.subtract_bounds(left_interval[1], right_interval[0]))
+        elif quadruple.operator == '*' and None not in left_interval + right_interval:
+            products = [left_bound * right_bound for left_bound in left_interval
+                for right_bound in right_interval]
+            interval = (min(products), max(products))
+        else:
+            interval = UNBOUNDED
+
+        if interval == UNBOUNDED:
+            intervals.pop(stored_address, None)
+        else:
+            intervals[stored_address] = interval
+
+    def add_bounds(self, bound, other_bound):
+        """Adds two ends of intervals, None when one is unbounded"""
+        if bound is None or other_bound is None:
+            return None
+        return bound + other_bound
+
+    def subtract_bounds(self, bound, other_bound):
+        """Subtracts two ends of intervals, None when one is unbounded"""
+        if bound is None or other_bound is None:
+            return None
+        return bound - other_bound
+
+    def intersect_intervals(self, interval, other_interval):
+        """Returns the values two intervals share, None when they share none"""
+        low = max([bound for bound in [interval[0], other_interval[0]] if bound is not None],
+            default=None)
+        high = min([bound for bound in [interval[1], other_interval[1]] if bound is not None],
+            default=None)
+        if low is not None and high is not None and low > high:
+            return None
+        return (low, high)
+
+    def is_inside(self, interval, other_interval):
+        """Checks if every value of an interval belongs to another one"""
+        return (interval[0] is not None and interval[1] is not None
+            and other_interval[0] <= interval[0] and interval[1] <= other_interval[1])
+
+    def join_intervals(self, incoming_intervals):
+        """Returns the intervals that contain the ones of every way a block is
+        reached, None when it is never reached"""
+        joined_intervals = None
+        for intervals in incoming_intervals:
+            if intervals is None:
+                continue
+            if joined_intervals is None:
+                joined_intervals = dict(intervals)
+                continue
+            for address in list(joined_intervals):
+                if address not in intervals:
+                    del joined_intervals[address]
+                    continue
+                low, high = joined_intervals[address]
+                other_low, other_high = intervals[address]
+                joined_intervals[address] = (
+                    None if low is None or other_low is None else min(low, other_low),
+                    None if high is None or other_high is None else max(high, other_high))
+        return joined_intervals
+
+    def widen_intervals(self, old_intervals, new_intervals):
+        """Returns the new intervals with the ends that grew since the old ones
+        unbounded"""
+        widened_intervals = {}
+        for address, (low, high) in new_intervals.items():
+            if address not in old_intervals:
+                continue
+            old_low, old_high = old_intervals[address]
+            if low is None or (old_low is not None and low < old_low):
+                low = None
+            if high is None or (old_high is not None and high > old_high):
+                high = None
+            if (low, high) != UNBOUNDED:
+                widened_intervals[address] = (low, high)
+        return widened_intervals
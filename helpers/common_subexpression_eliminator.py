@@ -0,0 +1,119 @@
+from .control_flow_graph import ControlFlowGraph
+from .quadruple_editor import QuadrupleEditor
+
+# Operations whose result only depends on the values of their operands
+VALUE_OPERATORS = ['+', '-', '*', '/', '>', '<', '>=', '<=', '==', '!=', 'and', 'or']
+
+# Operations whose operands can be swapped
+COMMUTATIVE_OPERATORS = ['+', '*', '==', '!=']
+
+class CommonSubexpressionEliminator():
+    """Numbers the values computed in every block, an operation that computes a
+    value a variable already holds copies that variable instead"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.address_values = {}
+        self.value_counter = 0
+
+    def optimize(self):
+        """Eliminates the common subexpressions of every block, returns the
+        number of quadruples replaced or removed"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+
+        eliminated_quadruples = 0
+        for function_name, start, end in editor.get_function_quadruples():
+            control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+            for block in control_flow_graph.blocks:
+                eliminated_quadruples += self.number_block(block, editor)
+
+        editor.close()
+        return eliminated_quadruples
+
+    def get_value_number(self, address):
+        """Returns the value number an address holds, an address without one
+        holds the value it had when the block started"""
+        if address not in self.address_values:
+            self.address_values[address] = self.new_value_number()
+        return self.address_values[address]
+
+    def new_value_number(self):
+        """Returns a value number no address holds"""
+        self.value_counter += 1
+        return self.value_counter
+
+    def forget_global_values(self):
+        """Forgets the value numbers the global variables hold"""
+        global_memory = self.memory.global_memory
+        self.address_values = {address : value_number for address, value_number
+            in self.address_values.items() if not global_memory.contains(address)}
+
+    def number_block(self, block, editor):
+        """Numbers the values of a block and eliminates the operations that
+        compute a value again, returns the number of quadruples eliminated"""
+        # Value number each address holds, of each operation and of the
+        # dimensioned variable indexes already verified
+        self.address_values = {}
+        self.value_counter = 0
+        operation_values = {}
+        verified_indexes = set()
+        eliminated_quadruples = 0
+
+        for quadruple in block:
+            operator = quadruple.operator
+            stored_address = quadruple.get_stored_address()
+
+            if operator in VALUE_OPERATORS and not isinstance(quadruple.left_operand, dict) and (
+                    not isinstance(quadruple.right_operand, dict)):
+                operand_values = (self.get_value_number(quadruple.left_operand),
+                    self.get_value_number(quadruple.right_operand))
+                if operator in COMMUTATIVE_OPERATORS:
+                    operand_values = tuple(sorted(operand_values))
+                operation = (operator,) + operand_values
+
+                value_number = None
+                if operation in operation_values:
+                    # Looks for a variable that still holds the value
+                    value_number = operation_values[operation]
+                    holders = [address for address, address_value in self.address_values.items()
+                        if address_value == value_number]
+                    if holders and stored_address is not None:
+                        quadruple.operator = '='
+                        quadruple.left_operand = holders[0]
+                        quadruple.right_operand = None
+                        eliminated_quadruples += 1
+                    elif not holders:
+                        value_number = None
+                if value_number is None:
+                    value_number = self.new_value_number()
+                    operation_values[operation] = value_number
+            elif operator == '=' or operator == 'RETURN':
+                if isinstance(quadruple.left_operand, dict):
+                    value_number = self.new_value_number()
+                else:
+                    value_number = self.get_value_number(quadruple.left_operand)
+            elif operator == 'VERF_INDEX':
+                # An index already verified against the same limits is valid
+                verification = (self.get_value_number(quadruple.left_operand),
+                    quadruple.right_operand, quadruple.result)
+                if verification in verified_indexes:
+                    editor.remove(quadruple)
+                    eliminated_quadruples += 1
+                else:
+                    verified_indexes.add(verification)
+                continue
+            else:
+                value_number = self.new_value_number()
+
+            if stored_address is not None:
+                self.address_values[stored_address] = value_number
+            elif isinstance(quadruple.result, dict) or operator == 'GOSUB':
+                # The dimensioned variables are placed in the global memory, a
+                # store to one of them or the function called may change any
+                # global variable
+                self.forget_global_values()
+
+        return eliminated_quadruples
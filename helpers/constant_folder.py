@@ -0,0 +1,151 @@
+from .control_flow_graph import ControlFlowGraph
+from .opcodes import FUSED_BRANCHES
+from .quadruple_editor import QuadrupleEditor
+
+import operator
+
+# Operations that can be solved while compiling when their operands are constants
+FOLDING_OPERATIONS = {
+    '+' : operator.add,
+    '-' : operator.sub,
+    '*' : operator.mul,
+    '>' : operator.gt,
+    '<' : operator.lt,
+    '>=' : operator.ge,
+    '<=' : operator.le,
+    '==' : operator.eq,
+    '!=' : operator.ne,
+    'and' : lambda left_operand, right_operand: left_operand and right_operand,
+    'or' : lambda left_operand, right_operand: left_operand or right_operand
+}
+
+# Comparison of each fused conditional jump
+FOLDING_COMPARISONS = {jump : FOLDING_OPERATIONS[relational]
+    for relational, jump in FUSED_BRANCHES.items()}
+
+# Converts a folded value to the type the semantic cube gives to the result
+TYPE_CONVERSIONS = {
+    'int' : int,
+    'float' : float,
+    'string' : str,
+    'bool' : bool
+}
+
+class ConstantFolder():
+    """Solves the operations whose operands are known constants while compiling
+    and propagates the constants assigned to variables through every block"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.constant_memory = program.memory.constant_memory
+        self.semantic_cube = program.semantic_cube
+
+    def fold_operation(self, operator_name, left_operand, right_operand):
+        """Returns the constant address of the result of an operation of two
+        constants, None when it has to be solved while executing"""
+        left_type = self.constant_memory.determines_segment_tpye(left_operand)
+        right_type = self.constant_memory.determines_segment_tpye(right_operand)
+        result_type = self.semantic_cube.get_semantic_type(left_type, right_type, operator_name)
+        if result_type not in TYPE_CONVERSIONS:
+            return None
+
+        left_value = self.memory.get_value(left_operand)
+        right_value = self.memory.get_value(right_operand)
+        if operator_name == '/':
+            # Divisions by 0 stop the program while executing
+            if right_value == 0:
+                return None
+            elif isinstance(left_value, float) or isinstance(right_value, float):
+                result = left_value / right_value
+            else:
+                result = int(left_value / right_value)
+        else:
+            result = FOLDING_OPERATIONS[operator_name](left_value, right_value)
+
+        return self.memory.get_constant_address(result_type, TYPE_CONVERSIONS[result_type](result))
+
+    def fold_jump(self, quadruple, editor):
+        """Solves a conditional jump whose operands are constants, it becomes a
+        GOTO when it always jumps and it is removed when it never does"""
+        if quadruple.operator == 'GOTOF' and self.constant_memory.contains(quadruple.left_operand):
+            jumps = not self.memory.get_value(quadruple.left_operand)
+        elif (quadruple.operator == 'GOTOT'
+                and self.constant_memory.contains(quadruple.left_operand)):
+            jumps = bool(self.memory.get_value(quadruple.left_operand))
+        elif (quadruple.operator in FOLDING_COMPARISONS
+                and self.constant_memory.contains(quadruple.left_operand)
+                and self.constant_memory.contains(quadruple.right_operand)):
+            jumps = not FOLDING_COMPARISONS[quadruple.operator](
+                self.memory.get_value(quadruple.left_operand),
+                self.memory.get_value(quadruple.right_operand))
+        else:
+            return False
+
+        if jumps:
+            quadruple.operator = 'GOTO'
+            quadruple.left_operand = None
+            quadruple.right_operand = None
+        else:
+            editor.remove(quadruple)
+        return True
+
+    def fold_block(self, block, editor):
+        """Folds and propagates the constants of a block, returns the number of
+        quadruples folded"""
+        # Constant address each variable is known to hold
+        known_constants = {}
+        folded_quadruples = 0
+
+        for quadruple in block:
+            # Variables known to hold a constant are replaced by it
+            for address in quadruple.get_used_addresses():
+                if address in known_constants:
+                    quadruple.replace_used_address(address, known_constants[address])
+
+            if (quadruple.operator in FOLDING_OPERATIONS or quadruple.operator == '/') and (
+                    self.constant_memory.contains(quadruple.left_operand)
+                    and self.constant_memory.contains(quadruple.right_operand)):
+                constant_address = self.fold_operation(quadruple.operator,
+                    quadruple.left_operand, quadruple.right_operand)
+                if constant_address is not None:
+                    quadruple.operator = '='
+                    quadruple.left_operand = constant_address
+                    quadruple.right_operand = None
+                    folded_quadruples += 1
+            elif self.fold_jump(quadruple, editor):
+                folded_quadruples += 1
+
+            stored_address = quadruple.get_stored_address()
+            if stored_address is not None:
+                known_constants.pop(stored_address, None)
+                if (quadruple.operator == '='
+                        and self.constant_memory.contains(quadruple.left_operand)):
+                    known_constants[stored_address] = quadruple.left_operand
+            elif isinstance(quadruple.result, dict):
+                # A dimensioned variable may be any variable
+                known_constants = {}
+
+            if quadruple.operator == 'GOSUB':
+                # The function called may change any global variable
+                global_memory = self.memory.global_memory
+                known_constants = {address : constant for address, constant
+                    in known_constants.items() if not global_memory.contains(address)}
+
+        return folded_quadruples
+
+    def optimize(self):
+        """Folds the constants of every function, returns the number of
+        quadruples folded"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+
+        folded_quadruples = 0
+        for function_name, start, end in editor.get_function_quadruples():
+            control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+            for block in control_flow_graph.blocks:
+                folded_quadruples += self.fold_block(block, editor)
+
+        editor.close()
+        return folded_quadruples
@@ -0,0 +1,259 @@
+class ControlFlowGraph():
+    """The basic blocks of the quadruples of a function and the jumps between
+    them, it is built while a QuadrupleEditor is open so the jumps point to
+    quadruples"""
+
+    def __init__(self, quadruples):
+        """Class constructor"""
+        self.quadruples = quadruples
+        self.blocks = []
+        self.successors = []
+        self.predecessors = []
+
+        positions = {id(quadruple) : position for position, quadruple in enumerate(quadruples)}
+
+        # A block starts at the first quadruple, at the quadruples other ones
+        # jump to and after a jump or the end of the function
+        leaders = set([0])
+        for position, quadruple in enumerate(quadruples):
+            if self.is_branch(quadruple):
+                if id(quadruple.result) in positions:
+                    leaders.add(positions[id(quadruple.result)])
+                leaders.add(position + 1)
+            elif quadruple.operator == 'ENDPROC':
+                leaders.add(position + 1)
+        leaders = sorted(leader for leader in leaders if leader < len(quadruples))
+
+        for block_number, leader in enumerate(leaders):
+            if block_number + 1 < len(leaders):
+                self.blocks.append(quadruples[leader:leaders[block_number + 1]])
+            else:
+                self.blocks.append(quadruples[leader:])
+
+        # Block each quadruple that starts a block belongs to
+        self.block_numbers = {id(block[0]) : block_number
+            for block_number, block in enumerate(self.blocks)}
+
+        for block_number, block in enumerate(self.blocks):
+            last_quadruple = block[-1]
+            successors = []
+            if last_quadruple.operator != 'GOTO' and last_quadruple.operator != 'ENDPROC':
+                # Execution continues in the next block
+                if block_number + 1 < len(self.blocks):
+                    successors.append(block_number + 1)
+            if self.is_branch(last_quadruple) and id(last_quadruple.result) in self.block_numbers:
+                jump_block = self.block_numbers[id(last_quadruple.result)]
+                if jump_block not in successors:
+                    successors.append(jump_block)
+            self.successors.append(successors)
+
+        self.predecessors = [[] for block in self.blocks]
+        for block_number, successors in enumerate(self.successors):
+            for successor in successors:
+                self.predecessors[successor].append(block_number)
+
+    def is_branch(self, quadruple):
+        """Checks if a quadruple jumps inside the function, a GOSUB jumps to
+        another function and returns"""
+        return quadruple.is_jump() and quadruple.operator != 'GOSUB'
+
+    def get_block_number(self, quadruple):
+        """Returns the block a quadruple starts, None if it doesn't start one"""
+        return self.block_numbers.get(id(quadruple))
+
+    def get_reachable_blocks(self):
+        """Returns the blocks the execution can reach from the first one"""
+        reachable_blocks = set()
+        pending_blocks = [0] if self.blocks else []
+        while pending_blocks:
+            block_number = pending_blocks.pop()
+            if block_number not in reachable_blocks:
+                reachable_blocks.add(block_number)
+                pending_blocks.extend(self.successors[block_number])
+        return reachable_blocks
+
+    def compute_dominators(self):
+        """Returns the blocks that dominate every block, a block dominates
+        another when every path from the first block to it goes through it"""
+        dominators = [set(range(len(self.blocks))) for block in self.blocks]
+        if self.blocks:
+            dominators[0] = set([0])
+
+        changed = True
+        while changed:
+            changed = False
+            for block_number in range(1, len(self.blocks)):
+                new_dominators = None
+                for predecessor in self.predecessors[block_number]:
+                    if new_dominators is None:
+                        new_dominators = set(dominators[predecessor])
+                    else:
+                        new_dominators &= dominators[predecessor]
+                new_dominators = (new_dominators or set()) | set([block_number])
+                if new_dominators != dominators[block_number]:
+                    dominators[block_number] = new_dominators
+                    changed = True
+
+        return dominators
+
+    def get_reverse_postorder(self):
+        """Returns the blocks reachable from the first one, each block comes
+        before its successors except when they jump back to it"""
+        postorder = []
+        visited_blocks = set()
+        pending_blocks = [(0, 0)] if self.blocks else []
+        while pending_blocks:
+            block_number, successor_position = pending_blocks.pop()
+            visited_blocks.add(block_number)
+            successors = self.successors[block_number]
+            if successor_position < len(successors):
+                pending_blocks.append((block_number, successor_position + 1))
+                successor = successors[successor_position]
+                if successor not in visited_blocks:
+                    pending_blocks.append((successor, 0))
+            else:
+                postorder.append(block_number)
+        postorder.reverse()
+        return postorder
+
+    def compute_immediate_dominators(self):
+        """Returns the closest dominator of every block, the parent of the
+        block in the dominator tree. The first block and the blocks that are
+        never reached have None"""
+        order = self.get_reverse_postorder()
+        order_positions = {block_number : position for position, block_number in enumerate(order)}
+        immediate_dominators = [None] * len(self.blocks)
+        if not order:
+            return immediate_dominators
+        immediate_dominators[0] = 0
+
+        # The dominators of the predecessors are intersected walking up the
+        # tree until both paths meet
+        changed = True
+        while changed:
+            changed = False
+            for block_number in order[1:]:
+                new_dominator = None
+                for predecessor in self.predecessors[block_number]:
+                    if immediate_dominators[predecessor] is None:
+                        continue
+                    if new_dominator is None:
+                        new_dominator = predecessor
+                        continue
+                    other_dominator = predecessor
+                    while new_dominator != other_dominator:
+                        while order_positions[new_dominator] > order_positions[other_dominator]:
+                            new_dominator = immediate_dominators[new_dominator]
+                        while order_positions[other_dominator] > order_positions[new_dominator]:
+                            other_dominator = immediate_dominators[other_dominator]
+                if new_dominator != immediate_dominators[block_number]:
+                    immediate_dominators[block_number] = new_dominator
+                    changed = True
+
+        immediate_dominators[0] = None
+        return immediate_dominators
+
+    def get_dominator_tree(self, immediate_dominators):
+        """Returns the blocks every block immediately dominates"""
+        children = [[] for block in self.blocks]
+        for block_number, immediate_dominator in enumerate(immediate_dominators):
+            if immediate_dominator is not None:
+                children[immediate_dominator].append(block_number)
+        return children
+
+    def compute_dominance_frontiers(self, immediate_dominators):
+        """Returns the blocks where the dominance of every block ends, the
+        blocks it doesn't dominate that have a predecessor it dominates"""
+        frontiers = [set() for block in self.blocks]
+        for block_number, predecessors in enumerate(self.predecessors):
+            if block_number != 0 and immediate_dominators[block_number] is None:
+                continue
+            reached_predecessors = [predecessor for predecessor in predecessors
+                if predecessor == 0 or immediate_dominators[predecessor] is not None]
+            if len(reached_predecessors) < 2:
+                continue
+            for predecessor in reached_predecessors:
+                runner = predecessor
+                while runner is not None and runner != immediate_dominators[block_number]:
+                    frontiers[runner].add(block_number)
+                    runner = immediate_dominators[runner]
+        return frontiers
+
+    def get_natural_loops(self):
+        """Returns the header and the blocks of every loop, a loop is formed by
+        a jump back to a block that dominates the jumping block. The loops with
+        the same header are merged and the inner loops come first"""
+        dominators = self.compute_dominators()
+        loops = {}
+        for block_number, successors in enumerate(self.successors):
+            for successor in successors:
+                if successor in dominators[block_number]:
+                    # The loop has the blocks that reach the jump back without
+                    # going through the header
+                    loop_blocks = loops.setdefault(successor, set([successor]))
+                    pending_blocks = [block_number]
+                    while pending_blocks:
+                        pending_block = pending_blocks.pop()
+                        if pending_block not in loop_blocks:
+                            loop_blocks.add(pending_block)
+                            pending_blocks.extend(self.predecessors[pending_block])
+
+        return sorted(loops.items(), key=lambda loop: len(loop[1]))
+
+    def get_block_uses_and_definitions(self, block):
+        """Returns the addresses a block reads before writing them and the ones
+        it writes"""
+        uses = set()
+        definitions = set()
+        for quadruple in block:
+            for address in quadruple.get_used_addresses():
+                if address not in definitions:
+                    uses.add(address)
+            stored_address = quadruple.get_stored_address()
+            if stored_address is not None:
+                definitions.add(stored_address)
+        return uses, definitions
+
+    def compute_liveness(self):
+        """Returns the addresses that are live at the start and at the end of
+        every block, an address is live when a later quadruple may read it
+        before it is written again"""
+        block_uses = []
+        block_definitions = []
+        for block in self.blocks:
+            uses, definitions = self.get_block_uses_and_definitions(block)
+            block_uses.append(uses)
+            block_definitions.append(definitions)
+
+        live_in = [set() for block in self.blocks]
+        live_out = [set() for block in self.blocks]
+
+        # Iterates until no live set changes, the blocks are visited from the
+        # last one so most of them are solved in a single pass
+        changed = True
+        while changed:
+            changed = False
+            for block_number in reversed(range(len(self.blocks))):
+                new_live_out = set()
+                for successor in self.successors[block_number]:
+                    new_live_out |= live_in[successor]
+                new_live_in = block_uses[block_number] | (new_live_out - block_definitions[block_number])
+                if new_live_out != live_out[block_number] or new_live_in != live_in[block_number]:
+                    live_out[block_number] = new_live_out
+                    live_in[block_number] = new_live_in
+                    changed = True
+
+        return live_in, live_out
+
+    def get_live_after_quadruples(self, block_number, live_out):
+        """Returns the addresses that are live after each quadruple of a block"""
+        live = set(live_out[block_number])
+        live_after = []
+        for quadruple in reversed(self.blocks[block_number]):
+            live_after.append(set(live))
+            stored_address = quadruple.get_stored_address()
+            if stored_address is not None:
+                live.discard(stored_address)
+            live.update(quadruple.get_used_addresses())
+        live_after.reverse()
+        return live_after
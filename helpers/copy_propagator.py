@@ -0,0 +1,138 @@
+from .control_flow_graph import ControlFlowGraph
+from .opcodes import OPERAND_ROLES
+from .quadruple_editor import QuadrupleEditor
+
+# Operators that copy their left operand into their result
+COPY_OPERATORS = ['=', 'RETURN']
+
+class CopyPropagator():
+    """Reads the original variable instead of its copies and makes the results
+    be written straight into the variable they are copied to"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+
+    def has_dimensioned_operand(self, quadruple):
+        """Checks if the quadruple reads or writes a dimensioned variable"""
+        return any(isinstance(operand, dict) for operand in
+            [quadruple.left_operand, quadruple.right_operand, quadruple.result])
+
+    def optimize(self):
+        """Propagates the copies of every function, returns the number of
+        copies removed or replaced"""
+        return self.propagate_copies() + self.coalesce_copies()
+
+    def propagate_copies(self):
+        """Replaces the reads of a copy with the variable it copies while both
+        keep their values, returns the number of copies that copy a variable
+        into itself and are removed"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        removed_copies = 0
+
+        for function_name, start, end in editor.get_function_quadruples():
+            control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+            for block in control_flow_graph.blocks:
+                # Variable each copy holds
+                copies = {}
+                for quadruple in block:
+                    for address in quadruple.get_used_addresses():
+                        if address in copies:
+                            quadruple.replace_used_address(address, copies[address])
+
+                    stored_address = quadruple.get_stored_address()
+                    if stored_address is not None:
+                        # Copies of the variable written and the copy written
+                        # are no longer valid
+                        copies = {copy : original for copy, original in copies.items()
+                            if copy != stored_address and original != stored_address}
+
+                        if quadruple.operator in COPY_OPERATORS:
+                            if quadruple.left_operand == stored_address:
+                                editor.remove(quadruple)
+                                removed_copies += 1
+                            elif (self.memory.is_frame_variable(stored_address)
+                                    and not isinstance(quadruple.left_operand, dict)):
+                                copies[stored_address] = quadruple.left_operand
+                    elif isinstance(quadruple.result, dict):
+                        # A dimensioned variable may be any variable
+                        copies = {}
+                    elif quadruple.operator == 'GOSUB':
+                        # The function called may change any global variable
+                        global_memory = self.memory.global_memory
+                        copies = {copy : original for copy, original in copies.items()
+                            if not global_memory.contains(copy)
+                            and not global_memory.contains(original)}
+
+        editor.close()
+        return removed_copies
+
+    def can_move_store(self, between_quadruples, destination):
+        """Checks if a store can be moved before some quadruples, they can't
+        read or write its destination"""
+        for quadruple in between_quadruples:
+            if destination in quadruple.get_used_addresses() or quadruple.get_stored_address() == destination:
+                return False
+            # Calls and dimensioned variables may read or write any global
+            if self.memory.global_memory.contains(destination) and (quadruple.operator == 'GOSUB'
+                    or self.has_dimensioned_operand(quadruple)):
+                return False
+        return True
+
+    def coalesce_copies(self):
+        """Makes the quadruple that writes a temporal write the variable the
+        temporal is copied to when the copy is its only read, returns the number
+        of copies removed"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        removed_copies = 0
+
+        for function_name, start, end in editor.get_function_quadruples():
+            control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+            live_in, live_out = control_flow_graph.compute_liveness()
+            for block_number, block in enumerate(control_flow_graph.blocks):
+                live_after = control_flow_graph.get_live_after_quadruples(block_number, live_out)
+                for position, copy in enumerate(block):
+                    temporal = copy.left_operand
+                    if (copy.operator not in COPY_OPERATORS
+                            or not self.memory.temporal_memory.contains(temporal)
+                            or temporal in live_after[position] or temporal == copy.result):
+                        continue
+
+                    # Looks for the quadruple that writes the temporal, no other
+                    # quadruple may read it in between
+                    definition_position = position - 1
+                    while definition_position >= 0:
+                        quadruple = block[definition_position]
+                        if editor.is_removed(quadruple):
+                            definition_position -= 1
+                        elif quadruple.get_stored_address() == temporal:
+                            break
+                        elif temporal in quadruple.get_used_addresses():
+                            definition_position = -1
+                        else:
+                            definition_position -= 1
+                    if definition_position < 0:
+                        continue
+
+                    definition = block[definition_position]
+                    between_quadruples = [quadruple for quadruple in block[definition_position + 1:position]
+                        if not editor.is_removed(quadruple)]
+                    if OPERAND_ROLES[definition.operator][2] != 'store' or definition.operator == 'RETURN':
+                        continue
+
+                    # The quadruples only write elements of dimensioned variables
+                    # through copies, the other passes expect addresses
+                    if isinstance(copy.result, dict):
+                        continue
+                    if not self.can_move_store(between_quadruples, copy.result):
+                        continue
+
+                    definition.result = copy.result
+                    editor.remove(copy)
+                    removed_copies += 1
+
+        editor.close()
+        return removed_copies
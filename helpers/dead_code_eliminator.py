@@ -0,0 +1,125 @@
+from .control_flow_graph import ControlFlowGraph
+from .quadruple_editor import QuadrupleEditor
+
+# Operators that only write their result, they can be removed when the result
+# is never read
+PURE_OPERATORS = ['+', '-', '*', '=', '>', '<', '>=', '<=', '==', '!=', 'and', 'or']
+
+class DeadCodeEliminator():
+    """Removes the quadruples that are never executed and the ones whose result
+    is never read, and makes every jump go straight to its final quadruple"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.temporal_memory = program.memory.temporal_memory
+        self.constant_memory = program.memory.constant_memory
+
+    def is_pure(self, quadruple):
+        """Checks if the only effect of a quadruple is writing its result, a
+        division may also stop the program when it divides by 0"""
+        if quadruple.operator in PURE_OPERATORS:
+            return True
+        elif quadruple.operator == '/':
+            right_operand = quadruple.right_operand
+            return (self.constant_memory.contains(right_operand)
+                and self.memory.get_value(right_operand) != 0)
+        else:
+            return False
+
+    def optimize(self):
+        """Cleans the quadruples of the program, returns the number of
+        quadruples removed"""
+        self.thread_jumps()
+        removed_quadruples = self.remove_unreachable_quadruples()
+        removed_quadruples += self.remove_dead_stores()
+        removed_quadruples += self.remove_jumps_to_next_quadruple()
+        return removed_quadruples
+
+    def thread_jumps(self):
+        """Makes the jumps to a GOTO go to the quadruple the GOTO jumps to,
+        returns the number of jumps changed"""
+        editor = QuadrupleEditor(self.program)
+        threaded_jumps = 0
+
+        for quadruple in self.program.quadruple_list:
+            if quadruple.is_jump() and quadruple.operator != 'GOSUB':
+                # Follows the chain of GOTOs, a chain may be a loop
+                visited_quadruples = set([id(quadruple)])
+                target = quadruple.result
+                while (target is not editor.end_mark and target.operator == 'GOTO'
+                        and id(target) not in visited_quadruples):
+                    visited_quadruples.add(id(target))
+                    target = target.result
+                if target is not quadruple.result:
+                    quadruple.result = target
+                    threaded_jumps += 1
+
+        editor.close()
+        return threaded_jumps
+
+    def remove_unreachable_quadruples(self):
+        """Removes the quadruples no path of its function reaches, returns the
+        number of quadruples removed"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        removed_quadruples = 0
+
+        for function_name, start, end in editor.get_function_quadruples():
+            control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+            reachable_blocks = control_flow_graph.get_reachable_blocks()
+            for block_number, block in enumerate(control_flow_graph.blocks):
+                if block_number not in reachable_blocks:
+                    for quadruple in block:
+                        editor.remove(quadruple)
+                        removed_quadruples += 1
+
+        editor.close()
+        return removed_quadruples
+
+    def remove_dead_stores(self):
+        """Removes the quadruples that write a temporal nobody reads, until no
+        more quadruples are removed, returns the number of quadruples removed"""
+        removed_quadruples = 0
+        removed = True
+        while removed:
+            editor = QuadrupleEditor(self.program)
+            quadruple_list = self.program.quadruple_list
+            removed = False
+
+            for function_name, start, end in editor.get_function_quadruples():
+                control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+                live_in, live_out = control_flow_graph.compute_liveness()
+                for block_number, block in enumerate(control_flow_graph.blocks):
+                    live_after = control_flow_graph.get_live_after_quadruples(block_number, live_out)
+                    for quadruple, live in zip(block, live_after):
+                        stored_address = quadruple.get_stored_address()
+                        if (self.temporal_memory.contains(stored_address)
+                                and stored_address not in live and self.is_pure(quadruple)):
+                            editor.remove(quadruple)
+                            removed_quadruples += 1
+                            removed = True
+
+            editor.close()
+        return removed_quadruples
+
+    def remove_jumps_to_next_quadruple(self):
+        """Removes the GOTOs that jump to the quadruple after them, returns the
+        number of quadruples removed"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        removed_quadruples = 0
+
+        # The quadruples are visited from the last one so a GOTO removed lets
+        # the GOTO before it jump to its next quadruple
+        next_quadruple = editor.end_mark
+        for quadruple in reversed(quadruple_list):
+            if quadruple.operator == 'GOTO' and quadruple.result is next_quadruple:
+                editor.remove(quadruple)
+                removed_quadruples += 1
+            else:
+                next_quadruple = quadruple
+
+        editor.close()
+        return removed_quadruples
@@ -1,5 +1,6 @@
 import json # Used to give format at printing dictionaries
 
+from .memory_segment import DEFAULT_VALUES
 from .variable_table import VariableTable
 
 class FunctionDirectory():
@@ -34,7 +35,13 @@ class FunctionDirectory():
                 'float' : 0,
                 'string' : 0,
                 'bool' : 0
-            }
+            },
+            'frame_layout' : {
+                'local' : {},
+                'temporal' : {}
+            },
+            'frame_values' : [],
+            'pure' : False
         }
 
     def has_function(self, function_name):
@@ -155,6 +162,24 @@ class FunctionDirectory():
         else:
             print("The function you are trying to add the adress doesn't exists")
 
+    def set_function_frame_layout(self, function_name):
+        """Calculates where the local and temporal variables of the function are
+        placed in its frame of the call stack and the values the frame starts with"""
+        function = self.get_function(function_name)
+        if function is not None:
+            frame_values = []
+
+            # Each type of each memory takes the next positions of the frame
+            for memory_type, counter in [('local', 'number_of_local_variables'),
+                    ('temporal', 'number_of_temporal_variables')]:
+                for variable_type, total_variables in function[counter].items():
+                    function['frame_layout'][memory_type][variable_type] = len(frame_values)
+                    frame_values.extend([DEFAULT_VALUES[variable_type]] * total_variables)
+
+            function['frame_values'] = frame_values
+        else:
+            print("The function you are trying to set the frame doesn't exists")
+
     def get_function_quadruple_number(self, function_name,):
         """Retrieves the quadruple number of a function"""
         function = self.get_function(function_name)
@@ -0,0 +1,152 @@
+from .control_flow_graph import ControlFlowGraph
+from .memory_segment import DEFAULT_VALUES
+from .quadruple import Quadruple
+from .quadruple_editor import QuadrupleEditor
+
+# Largest number of quadruples a function may have to be inlined, its ENDPROC
+# is not counted
+INLINING_SIZE_BUDGET = 12
+
+class FunctionInliner():
+    """Replaces the calls to small functions that never call themselves with a
+    copy of their quadruples, the variables of the copy are new temporals of
+    the function that makes the call"""
+
+    def __init__(self, program, size_budget=INLINING_SIZE_BUDGET):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.function_directory = program.function_directory
+        self.size_budget = size_budget
+
+    def optimize(self):
+        """Inlines the calls to the small functions, returns the number of
+        calls inlined"""
+        inlined_calls = 0
+        inlined = True
+        while inlined:
+            # A single call is inlined each time, the quadruples of the
+            # functions change when one is inlined
+            editor = QuadrupleEditor(self.program)
+            quadruple_list = self.program.quadruple_list
+            functions = {function_name : quadruple_list[start:end] for function_name, start, end
+                in editor.get_function_quadruples()}
+            inlined = self.inline_first_call(functions, editor)
+            editor.close()
+            inlined_calls += inlined
+        return inlined_calls
+
+    def get_recursive_functions(self, functions):
+        """Returns the functions of the call graph that can call themselves,
+        directly or through other functions"""
+        called_functions = {function_name : set(quadruple.left_operand for quadruple in quadruples
+            if quadruple.operator == 'GOSUB') for function_name, quadruples in functions.items()}
+
+        recursive_functions = set()
+        for function_name in functions:
+            reached_functions = set()
+            pending_functions = list(called_functions[function_name])
+            while pending_functions:
+                called_function = pending_functions.pop()
+                if called_function not in reached_functions:
+                    reached_functions.add(called_function)
+                    pending_functions.extend(called_functions.get(called_function, []))
+            if function_name in reached_functions:
+                recursive_functions.add(function_name)
+        return recursive_functions
+
+    def can_inline(self, function_name, functions, recursive_functions):
+        """Checks if the calls to a function can be replaced by its quadruples"""
+        quadruples = functions.get(function_name)
+        return (function_name not in recursive_functions and quadruples is not None
+            and quadruples[-1].operator == 'ENDPROC' and len(quadruples) - 1 <= self.size_budget)
+
+    def inline_first_call(self, functions, editor):
+        """Inlines the first call to a function that can be inlined, returns
+        1 when a call is inlined and 0 otherwise"""
+        recursive_functions = self.get_recursive_functions(functions)
+        for function_name, quadruples in functions.items():
+            for call_position, call in enumerate(quadruples):
+                if (call.operator == 'GOSUB' and call.left_operand != function_name
+                        and self.can_inline(call.left_operand, functions, recursive_functions)
+                        and self.inline_call(function_name, quadruples, call_position,
+                            functions[call.left_operand], editor)):
+                    return 1
+        return 0
+
+    def get_new_addresses(self, function_name, called_function, called_quadruples):
+        """Returns a new temporal of a function for every local and temporal
+        variable of the function it calls, None when it has no temporals left"""
+        frame_addresses = list(called_function['parameters']['addresses'])
+        for quadruple in called_quadruples:
+            for address in quadruple.get_used_addresses() + [quadruple.get_stored_address()]:
+                if self.memory.is_frame_variable(address) and address not in frame_addresses:
+                    frame_addresses.append(address)
+
+        new_addresses = {}
+        for address in frame_addresses:
+            address_type = self.memory.locate_memory_segment(address).determines_segment_tpye(address)
+            new_addresses[address] = self.program.request_function_temporal(function_name,
+                address_type)
+            if new_addresses[address] is None:
+                return None
+        return new_addresses
+
+    def inline_call(self, function_name, quadruples, call_position, called_quadruples, editor):
+        """Replaces a call with a copy of the quadruples of the function called,
+        returns False when it can't be inlined"""
+        quadruple_list = self.program.quadruple_list
+        call = quadruples[call_position]
+        called_function = self.function_directory.function_list[call.left_operand]
+        parameter_addresses = called_function['parameters']['addresses']
+
+        era_position, parameter_positions = editor.get_call_quadruples(quadruples, call_position)
+        if era_position < 0 or len(parameter_positions) != len(parameter_addresses):
+            return False
+        new_addresses = self.get_new_addresses(function_name, called_function, called_quadruples)
+        if new_addresses is None:
+            return False
+
+        # A frame starts with the default values, the variables read before
+        # they are written get them first
+        control_flow_graph = ControlFlowGraph(called_quadruples)
+        live_in, live_out = control_flow_graph.compute_liveness()
+        inlined_quadruples = []
+        for address in sorted(live_in[0]):
+            if self.memory.is_frame_variable(address) and address not in parameter_addresses:
+                address_type = self.memory.locate_memory_segment(address).determines_segment_tpye(address)
+                default_address = self.memory.get_constant_address(address_type,
+                    DEFAULT_VALUES[address_type])
+                if default_address is None:
+                    return False
+                inlined_quadruples.append(Quadruple(0, '=', default_address, None,
+                    new_addresses[address]))
+
+        # The jumps to the end of the function go to the quadruple after the
+        # call
+        position = next(position for position, quadruple in enumerate(quadruple_list)
+            if quadruple is call)
+        if position + 1 < len(quadruple_list):
+            next_quadruple = quadruple_list[position + 1]
+        else:
+            next_quadruple = editor.end_mark
+        copies = {id(called_quadruples[-1]) : next_quadruple}
+        for quadruple in called_quadruples[:-1]:
+            copies[id(quadruple)] = quadruple.copy()
+        for quadruple in called_quadruples[:-1]:
+            copy = copies[id(quadruple)]
+            copy.rename_addresses(new_addresses)
+            if copy.is_jump() and copy.operator != 'GOSUB':
+                copy.result = copies[id(quadruple.result)]
+            inlined_quadruples.append(copy)
+
+        # The arguments are assigned to the copies of the parameters
+        editor.remove(quadruples[era_position])
+        for parameter_position, parameter_address in zip(parameter_positions, parameter_addresses):
+            parameter = quadruples[parameter_position]
+            parameter.operator = '='
+            parameter.result = new_addresses[parameter_address]
+
+        quadruple_list[position:position] = inlined_quadruples
+        editor.remove(call)
+        return True
@@ -0,0 +1,182 @@
+from .control_flow_graph import ControlFlowGraph
+from .quadruple import Quadruple
+from .quadruple_editor import QuadrupleEditor
+
+class InductionVariableReducer():
+    """Keeps the sums of a loop variable incremented by the same amount in
+    every iteration, like the addresses of the elements of a dimensioned
+    variable it walks, in their own variables incremented along with it
+    instead of adding them again in every access"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.temporal_segment = program.memory.temporal_memory
+
+    def is_invariant(self, address, stores, changes_globals):
+        """Checks if an address holds the same value in every iteration of a
+        loop"""
+        if self.memory.constant_memory.contains(address):
+            return True
+        elif isinstance(address, dict) or address in stores:
+            return False
+        else:
+            return not (self.memory.global_memory.contains(address) and changes_globals)
+
+    def optimize(self):
+        """Reduces the induction variables of every loop, returns the number of
+        additions removed"""
+        reduced_quadruples = 0
+        reduced = True
+        while reduced:
+            # The variables of a single loop are reduced each time, the list
+            # positions of the other loops change when quadruples are inserted
+            editor = QuadrupleEditor(self.program)
+            quadruple_list = self.program.quadruple_list
+            reduced = 0
+
+            for function_name, start, end in editor.get_function_quadruples():
+                control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+                reduced = self.reduce_function_loops(function_name, control_flow_graph, editor)
+                if reduced:
+                    break
+
+            editor.close()
+            reduced_quadruples += reduced
+        return reduced_quadruples
+
+    def get_basic_induction_variables(self, loop_quadruples, stores, changes_globals):
+        """Returns the frame variables a loop only writes by adding or
+        subtracting an invariant, with the quadruple that does it"""
+        induction_variables = {}
+        for quadruple in loop_quadruples:
+            variable = quadruple.get_stored_address()
+            if (quadruple.operator not in ['+', '-'] or not self.memory.is_frame_variable(variable)
+                    or stores[variable] != 1):
+                continue
+            if quadruple.left_operand == variable:
+                step = quadruple.right_operand
+            elif quadruple.operator == '+' and quadruple.right_operand == variable:
+                step = quadruple.left_operand
+            else:
+                continue
+            if self.is_invariant(step, stores, changes_globals):
+                induction_variables[variable] = quadruple
+        return induction_variables
+
+    def get_derived_induction_variables(self, control_flow_graph, loop_blocks,
+            induction_variables, stores, changes_globals, live_in, live_out):
+        """Returns the additions of an invariant to a basic induction variable
+        grouped by their operands, each one writes a temporal only read in its
+        block before the induction variable changes"""
+        derived_variables = {}
+        for block_number in sorted(loop_blocks):
+            block = control_flow_graph.blocks[block_number]
+            live_after = control_flow_graph.get_live_after_quadruples(block_number, live_out)
+            for position, quadruple in enumerate(block):
+                temporal = quadruple.get_stored_address()
+                if (quadruple.operator != '+' or not self.temporal_segment.contains(temporal)
+                        or isinstance(quadruple.left_operand, dict)
+                        or isinstance(quadruple.right_operand, dict) or stores[temporal] != 1 or temporal in induction_variables
+                        or temporal in live_in[block_number] or temporal in live_out[block_number]):
+                    continue
+
+                if (quadruple.right_operand in induction_variables and
+                        self.is_invariant(quadruple.left_operand, stores, changes_globals)):
+                    variable = quadruple.right_operand
+                elif (quadruple.left_operand in induction_variables and
+                        self.is_invariant(quadruple.right_operand, stores, changes_globals)):
+                    variable = quadruple.left_operand
+                else:
+                    continue
+
+                # The temporal can't be read after the induction variable
+                # changes
+                if any(later_quadruple.get_stored_address() == variable
+                        and temporal in live_after[later_position]
+                        for later_position, later_quadruple in enumerate(block)
+                        if later_position >= position):
+                    continue
+
+                operation = (quadruple.left_operand, quadruple.right_operand)
+                derived_variables.setdefault(operation, []).append((block, position))
+        return derived_variables
+
+    def reduce_function_loops(self, function_name, control_flow_graph, editor):
+        """Reduces the induction variables of the first loop of a function that
+        has them, returns the number of additions removed"""
+        quadruple_list = self.program.quadruple_list
+        live_in, live_out = control_flow_graph.compute_liveness()
+
+        for header, loop_blocks in control_flow_graph.get_natural_loops():
+            loop_quadruples = [quadruple for block_number in sorted(loop_blocks)
+                for quadruple in control_flow_graph.blocks[block_number]]
+
+            # Number of times the loop writes each address, and if it calls a
+            # function or writes a dimensioned variable, which may change any
+            # global
+            stores = {}
+            changes_globals = False
+            for quadruple in loop_quadruples:
+                stored_address = quadruple.get_stored_address()
+                if stored_address is not None:
+                    stores[stored_address] = stores.get(stored_address, 0) + 1
+                elif isinstance(quadruple.result, dict) or quadruple.operator == 'GOSUB':
+                    changes_globals = True
+
+            induction_variables = self.get_basic_induction_variables(loop_quadruples,
+                stores, changes_globals)
+            derived_variables = self.get_derived_induction_variables(control_flow_graph,
+                loop_blocks, induction_variables, stores, changes_globals, live_in, live_out)
+            if not derived_variables:
+                continue
+
+            # Every sum gets a temporal that starts in the preheader
+            new_temporals = {}
+            for operation, definitions in derived_variables.items():
+                block, position = definitions[0]
+                temporal_type = self.temporal_segment.determines_segment_tpye(
+                    block[position].result)
+                new_temporal = self.program.request_function_temporal(function_name,
+                    temporal_type)
+                if new_temporal is not None:
+                    new_temporals[operation] = new_temporal
+            if not new_temporals:
+                continue
+
+            preheader = [Quadruple(0, '+', operation[0], operation[1], new_temporal)
+                for operation, new_temporal in new_temporals.items()]
+            if not editor.insert_preheader(control_flow_graph.blocks[header][0],
+                    set(id(quadruple) for quadruple in loop_quadruples), preheader):
+                continue
+
+            reduced_quadruples = 0
+            for operation, new_temporal in new_temporals.items():
+                # The reads of each sum read the new temporal instead
+                for block, position in derived_variables[operation]:
+                    temporal = block[position].result
+                    editor.remove(block[position])
+                    for later_quadruple in block[position + 1:]:
+                        later_quadruple.replace_used_address(temporal, new_temporal)
+                    reduced_quadruples += 1
+
+                # The new temporal changes along with its induction variable
+                if operation[1] in induction_variables:
+                    variable = operation[1]
+                else:
+                    variable = operation[0]
+                increment = induction_variables[variable]
+                if increment.left_operand == variable:
+                    step_quadruple = Quadruple(0, increment.operator, new_temporal,
+                        increment.right_operand, new_temporal)
+                else:
+                    step_quadruple = Quadruple(0, increment.operator, increment.left_operand,
+                        new_temporal, new_temporal)
+                position = next(position for position, quadruple in enumerate(quadruple_list)
+                    if quadruple is increment)
+                quadruple_list.insert(position + 1, step_quadruple)
+
+            return reduced_quadruples
+
+        return 0
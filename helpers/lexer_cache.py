@@ -0,0 +1,82 @@
+import hashlib
+import importlib.util
+import os
+import re
+import threading
+import time
+
+import ply.lex as lex
+
+# Version of the cached tables, the tables cached by other versions are not used
+LEXER_CACHE_VERSION = '1'
+
+class LexerCache():
+    """Builds the lexer of a module of token rules from tables cached on disk.
+    The tables are kept in a directory of the version of PLY and of the
+    cache, in a file named after the rules, so the rules are only validated
+    and the tables written again when a token changes"""
+
+    def __init__(self, rules, cache_directory):
+        """Class constructor"""
+        self.rules = rules
+        self.cache_directory = os.path.join(cache_directory, 'lexer-' + lex.__tabversion__
+            + '-' + LEXER_CACHE_VERSION)
+        self.table_path = None
+        self.build_time = None
+        self.generated = False
+
+    def get_table_path(self):
+        """Returns the file the tables of the rules are cached in"""
+        if self.table_path is None:
+            rules_dictionary = dict((name, getattr(self.rules, name)) for name in dir(self.rules))
+            rules_information = lex.LexerReflect(rules_dictionary, log=lex.NullLogger(),
+                reflags=int(re.VERBOSE))
+            rules_information.get_all()
+
+            # The rules are taken in the order PLY joins them in its master
+            # regular expression
+            parts = [repr(rules_information.tokens), repr(rules_information.literals),
+                repr(sorted(rules_information.stateinfo.items())),
+                repr(sorted(rules_information.ignore.items()))]
+            for state in sorted(rules_information.stateinfo):
+                for name, function in rules_information.funcsym[state]:
+                    parts.append(name + ' ' + str(function.__doc__))
+                for name, regular_expression in rules_information.strsym[state]:
+                    parts.append(name + ' ' + regular_expression)
+            key = hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+            self.table_path = os.path.join(self.cache_directory, 'lextab_' + key + '.py')
+        return self.table_path
+
+    def build_lexer(self):
+        """Returns the lexer of the rules, its tables come from the cache and
+        are written in it when they are not there"""
+        start_time = time.perf_counter()
+        table_path = self.get_table_path()
+        lexer = None
+
+        if os.path.exists(table_path):
+            try:
+                specification = importlib.util.spec_from_file_location('lextab', table_path)
+                tables = importlib.util.module_from_spec(specification)
+                specification.loader.exec_module(tables)
+                lexer = lex.lex(module=self.rules, optimize=True, lextab=tables)
+            except (SyntaxError, NameError, TypeError, ValueError, AttributeError, KeyError,
+                    ImportError):
+                # A damaged table file is written again
+                pass
+
+        self.generated = lexer is None
+        if self.generated:
+            lexer = lex.lex(module=self.rules)
+            try:
+                os.makedirs(self.cache_directory, exist_ok=True)
+                temporal_name = (os.path.splitext(os.path.basename(table_path))[0] + '_'
+                    + str(os.getpid()) + '_' + str(threading.get_ident()))
+                lexer.writetab(temporal_name, self.cache_directory)
+                os.replace(os.path.join(self.cache_directory, temporal_name + '.py'), table_path)
+            except OSError:
+                # The tables are not cached when the directory can't be written
+                pass
+
+        self.build_time = time.perf_counter() - start_time
+        return lexer
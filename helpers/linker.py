@@ -0,0 +1,115 @@
+from .memory import LOCAL_SEGMENT, TEMPORAL_SEGMENT
+from .opcodes import OPCODES, OPERAND_ROLES
+import sys
+
+# Segment position of the indirect operands, the ones that are the result of
+# dimensioned variables calls and hold the address of the value they refer to,
+# the other positions are the ones of the memory segments
+INDIRECT = 4
+
+# Segment position of the local and temporal operands, they are placed in the
+# frame of the function that is being executed
+FRAME = 5
+
+class Linker():
+    """Resolves the operands of a list of quadruples before they are executed"""
+
+    def __init__(self, memory, function_directory):
+        """Class constructor"""
+        self.memory = memory
+        self.function_directory = function_directory
+
+    def resolve_frame_slot(self, function, address):
+        """Returns the position of a local or temporal address inside the frame
+        of the function"""
+        memory_type = self.memory.determines_memory_type(address)
+        memory_segment = self.memory.locate_memory_segment(address)
+        segment_type = memory_segment.determines_segment_tpye(address)
+        type_position = (address - memory_segment.initial_address) % memory_segment.type_segment_size
+
+        if memory_type == 'local':
+            total_variables = function['number_of_local_variables'][segment_type]
+        else:
+            total_variables = function['number_of_temporal_variables'][segment_type]
+
+        if type_position < total_variables:
+            return function['frame_layout'][memory_type][segment_type] + type_position
+        else:
+            print("The address " + str(address) + " is outside the frame of the function " +
+                function['name'])
+            sys.exit()
+
+    def resolve_address(self, address, function):
+        """Returns the address as a tuple with the position of its memory segment
+        and its position inside the segment values, local and temporal addresses
+        are placed in the frame of the function"""
+        if isinstance(address, dict):
+            # The value of the index address is the address of the operand
+            return (INDIRECT, self.resolve_address(address['index_address'], function))
+
+        segment, slot = self.memory.locate_address(address)
+        if segment == LOCAL_SEGMENT or segment == TEMPORAL_SEGMENT:
+            if function is None:
+                print("The address " + str(address) + " is used outside a function")
+                sys.exit()
+            return (FRAME, self.resolve_frame_slot(function, address))
+        else:
+            return (segment, slot)
+
+    def resolve_operand(self, role, operand, function):
+        """Resolves an operand according to the role it has in its quadruple"""
+        if operand is None:
+            return None
+        elif role == 'address' or role == 'store':
+            return self.resolve_address(operand, function)
+        elif role == 'jump':
+            # Quadruples are numbered from 1, instructions from 0
+            return operand - 1
+        elif role == 'function':
+            return self.function_directory.get_function(operand)
+        else:
+            return operand
+
+    def link(self, quadruple_list):
+        """Returns the instructions as tuples of an opcode and its resolved
+        operands, in the same order the quadruples have"""
+        instructions = []
+        # Functions whose ERA has been found but not its GOSUB, and the number
+        # of parameters they have received
+        called_functions = []
+
+        # The frame of every function is placed according to its variables
+        for function_name in self.function_directory.function_list:
+            self.function_directory.set_function_frame_layout(function_name)
+
+        # Every quadruple belongs to the last function that starts before it
+        function_starts = sorted([(function['quadruple_number'], function)
+            for function in self.function_directory.function_list.values()
+            if function['quadruple_number'] > 0], key=lambda start: start[0])
+        function = None
+
+        for quadruple in quadruple_list:
+            while function_starts and function_starts[0][0] <= quadruple.quadruple_number:
+                function = function_starts.pop(0)[1]
+
+            left_role, right_role, result_role = OPERAND_ROLES[quadruple.operator]
+            left_operand = self.resolve_operand(left_role, quadruple.left_operand, function)
+            right_operand = self.resolve_operand(right_role, quadruple.right_operand, function)
+            result = self.resolve_operand(result_role, quadruple.result, function)
+
+            if quadruple.operator == 'ERA':
+                called_functions.append([left_operand, 0])
+            elif quadruple.operator == 'PARAMETER':
+                # The result of a parameter is the position of the parameter in
+                # the frame of the function called
+                function_called = called_functions[-1]
+                parameter_address = function_called[0]['parameters']['addresses'][function_called[1]]
+                function_called[1] += 1
+                result = self.resolve_frame_slot(function_called[0], parameter_address)
+            elif quadruple.operator == 'GOSUB':
+                called_functions.pop()
+
+            instructions.append((OPCODES[quadruple.operator], left_operand,
+                right_operand, result))
+
+        return instructions
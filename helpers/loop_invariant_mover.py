@@ -0,0 +1,138 @@
+from .control_flow_graph import ControlFlowGraph
+from .dead_code_eliminator import PURE_OPERATORS
+from .quadruple import Quadruple
+from .quadruple_editor import QuadrupleEditor
+
+class LoopInvariantMover():
+    """Moves the operations that compute the same value in every iteration of
+    a loop to a preheader, the quadruples placed before the loop header that
+    only run when the loop is entered"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+
+    def can_move(self, quadruple):
+        """Checks if a quadruple can run when its loop would not, it only writes
+        a temporal and it can't stop the program"""
+        operands = [quadruple.left_operand, quadruple.right_operand, quadruple.result]
+        if any(isinstance(operand, dict) for operand in operands):
+            return False
+        if not self.memory.temporal_memory.contains(quadruple.get_stored_address()):
+            return False
+        if quadruple.operator in PURE_OPERATORS:
+            return True
+        elif quadruple.operator == '/':
+            # A division by a variable may stop the program when it is 0
+            return (self.memory.constant_memory.contains(quadruple.right_operand)
+                and self.memory.get_value(quadruple.right_operand) != 0)
+        else:
+            return False
+
+    def optimize(self):
+        """Moves the invariant operations out of every loop, returns the number
+        of quadruples moved"""
+        moved_quadruples = 0
+        moved = True
+        while moved:
+            # The quadruples of a single loop are moved each time, the list
+            # positions of the other loops change when they are inserted
+            editor = QuadrupleEditor(self.program)
+            quadruple_list = self.program.quadruple_list
+            moved = 0
+
+            for function_name, start, end in editor.get_function_quadruples():
+                control_flow_graph = ControlFlowGraph(quadruple_list[start:end])
+                moved = self.move_function_invariants(control_flow_graph, editor)
+                if moved:
+                    break
+
+            editor.close()
+            moved_quadruples += moved
+        return moved_quadruples
+
+    def move_function_invariants(self, control_flow_graph, editor):
+        """Moves the invariant operations of the first loop of a function that
+        has them, returns the number of quadruples moved"""
+        live_in, live_out = control_flow_graph.compute_liveness()
+
+        for header, loop_blocks in control_flow_graph.get_natural_loops():
+            invariants = self.find_invariants(control_flow_graph, header, loop_blocks, live_in)
+            if not invariants:
+                continue
+
+            loop_quadruples = set(id(quadruple) for block_number in loop_blocks
+                for quadruple in control_flow_graph.blocks[block_number])
+            preheader = [Quadruple(quadruple.quadruple_number, quadruple.operator,
+                quadruple.left_operand, quadruple.right_operand, quadruple.result)
+                for quadruple in invariants]
+            if not editor.insert_preheader(control_flow_graph.blocks[header][0],
+                    loop_quadruples, preheader):
+                continue
+            for quadruple in invariants:
+                editor.remove(quadruple)
+
+            return len(preheader)
+
+        return 0
+
+    def find_invariants(self, control_flow_graph, header, loop_blocks, live_in):
+        """Returns the quadruples of a loop that can be moved to its preheader,
+        in an order where each one follows the ones it reads"""
+        loop_quadruples = [quadruple for block_number in sorted(loop_blocks)
+            for quadruple in control_flow_graph.blocks[block_number]]
+
+        # Number of times the loop writes each address, and if it calls a
+        # function or writes a dimensioned variable, which may change any global
+        stores = {}
+        changes_globals = False
+        for quadruple in loop_quadruples:
+            stored_address = quadruple.get_stored_address()
+            if stored_address is not None:
+                stores[stored_address] = stores.get(stored_address, 0) + 1
+            elif isinstance(quadruple.result, dict) or quadruple.operator == 'GOSUB':
+                changes_globals = True
+
+        # Addresses read after leaving the loop
+        exit_live = set()
+        for block_number in loop_blocks:
+            for successor in control_flow_graph.successors[block_number]:
+                if successor not in loop_blocks:
+                    exit_live |= live_in[successor]
+
+        invariants = []
+        invariant_quadruples = set()
+        invariant_addresses = set()
+        found = True
+        while found:
+            found = False
+            for quadruple in loop_quadruples:
+                if id(quadruple) in invariant_quadruples or not self.can_move(quadruple):
+                    continue
+
+                # The temporal is only written here and nobody reads the value
+                # it had before the loop or keeps after it
+                stored_address = quadruple.get_stored_address()
+                if (stores[stored_address] != 1 or stored_address in live_in[header]
+                        or stored_address in exit_live):
+                    continue
+
+                if all(self.is_invariant(address, stores, changes_globals, invariant_addresses)
+                        for address in quadruple.get_used_addresses()):
+                    invariants.append(quadruple)
+                    invariant_quadruples.add(id(quadruple))
+                    invariant_addresses.add(stored_address)
+                    found = True
+
+        return invariants
+
+    def is_invariant(self, address, stores, changes_globals, invariant_addresses):
+        """Checks if an address holds the same value in every iteration of a
+        loop"""
+        if self.memory.constant_memory.contains(address) or address in invariant_addresses:
+            return True
+        elif address in stores:
+            return False
+        else:
+            return not (self.memory.global_memory.contains(address) and changes_globals)
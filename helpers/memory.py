@@ -1,6 +1,14 @@
 from .memory_segment import MemorySegment
+from functools import reduce
+from math import gcd
 import sys
 
+# Positions of the memory segments in the list the memory keeps
+GLOBAL_SEGMENT = 0
+LOCAL_SEGMENT = 1
+CONSTANT_SEGMENT = 2
+TEMPORAL_SEGMENT = 3
+
 class Memory():
     """Represents a memory in a program for global, temporal and constant values"""
 
@@ -11,6 +19,42 @@ class Memory():
         self.constant_memory = MemorySegment('Constant', 20000, 2000)
         self.temporal_memory = MemorySegment('Temporal', 43000, 2000)
 
+        # The addresses are divided in blocks that belong to a single memory
+        # segment, the table finds the position of the segment of an address
+        # with a division
+        self.memory_segments = [None] * 4
+        self.memory_segments[GLOBAL_SEGMENT] = self.global_memory
+        self.memory_segments[LOCAL_SEGMENT] = self.local_memory
+        self.memory_segments[CONSTANT_SEGMENT] = self.constant_memory
+        self.memory_segments[TEMPORAL_SEGMENT] = self.temporal_memory
+        self.block_size = reduce(gcd, [memory_segment.initial_address
+            for memory_segment in self.memory_segments] + [memory_segment.final_address + 1
+            for memory_segment in self.memory_segments])
+        self.memory_table = [None] * (max([memory_segment.final_address
+            for memory_segment in self.memory_segments]) // self.block_size + 1)
+
+        for position, memory_segment in enumerate(self.memory_segments):
+            first_block = memory_segment.initial_address // self.block_size
+            last_block = memory_segment.final_address // self.block_size
+            for block in range(first_block, last_block + 1):
+                self.memory_table[block] = position
+
+    def locate_memory_segment(self, address):
+        """Returns the memory segment an address belongs to"""
+        block = address // self.block_size
+        if block >= 0 and block < len(self.memory_table) and self.memory_table[block] is not None:
+            return self.memory_segments[self.memory_table[block]]
+        else:
+            print("Invalid address: " + str(address))
+            sys.exit()
+
+    def locate_address(self, address):
+        """Returns the position of the memory segment of an address and the
+        position of the address inside the segment values"""
+        memory_segment = self.locate_memory_segment(address)
+        return (self.memory_table[address // self.block_size],
+            address - memory_segment.initial_address)
+
     def request_global_address(self, value_type, value=None,):
         """Request an address for a global variable"""
         return self.global_memory.request_address(value_type, value)
@@ -37,52 +81,38 @@ class Memory():
         return self.global_memory.request_sequential_addresses(value_type,
             total_addresses, value)
 
+    def is_frame_variable(self, address):
+        """Checks if an operand is a local or temporal variable, the functions
+        called can't change them"""
+        return self.local_memory.contains(address) or self.temporal_memory.contains(address)
+
     def determines_memory_type(self, address):
         """Returns the type of the memory according of the address"""
-        if (address >= self.global_memory.initial_address and address <=
-            self.global_memory.final_address):
-            return 'global'
-        elif (address >= self.local_memory.initial_address and address <=
-            self.local_memory.final_address):
-            return 'local'
-        elif (address >= self.temporal_memory.initial_address and address <=
-            self.temporal_memory.final_address):
-            return 'temporal'
-        elif (address >= self.constant_memory.initial_address and address <=
-            self.constant_memory.final_address):
-            return 'constant'
-        else:
-            print("Invalid address: " + str(address))
-            sys.exit()
+        return self.locate_memory_segment(address).name.lower()
 
     def get_value(self, address):
         """Returns a value according of the address"""
-        memory_type = self.determines_memory_type(address)
-        if memory_type == 'global':
-            return self.global_memory.get_value(address)
-        elif memory_type == 'local':
-            return self.local_memory.get_value(address)
-        elif memory_type == 'temporal':
-            return self.temporal_memory.get_value(address)
-        elif memory_type == 'constant':
-            return self.constant_memory.get_value(address)
+        memory_segment = self.locate_memory_segment(address)
+        return memory_segment.values[address - memory_segment.initial_address]
 
     def edit_value(self, address, value):
         """Edits the value related to an address"""
-        memory_type = self.determines_memory_type(address)
-        if memory_type == 'global':
-            self.global_memory.edit_value(address, value)
-        elif memory_type == 'local':
-            self.local_memory.edit_value(address, value)
-        elif memory_type == 'temporal':
-            self.temporal_memory.edit_value(address, value)
-        elif memory_type == 'constant':
-            self.constant_memory.edit_value(address, value)
+        memory_segment = self.locate_memory_segment(address)
+        memory_segment.values[address - memory_segment.initial_address] = value
 
     def check_existing_constant_value(self, value_type, value):
         """Checks if the value exists in the constant memory"""
         return self.constant_memory.check_existing_value(value_type, value)
 
+    def get_constant_address(self, value_type, value):
+        """Returns the constant address of a value, requesting one when the
+        value is not a constant yet. None if the constant memory of its type
+        is full"""
+        constant_address = self.check_existing_constant_value(value_type, value)
+        if constant_address is None and self.constant_memory.has_available_space(value_type):
+            constant_address = self.request_constant_address(value_type, value)
+        return constant_address
+
     def reset_temporal_memory(self):
         """Resets the temporal and local memory, clears all the addresses used"""
         self.local_memory.reset_memory()
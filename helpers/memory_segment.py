@@ -1,6 +1,14 @@
 from .type_segment import TypeSegment
 import sys
 
+# Value an address of each type has when it is requested without one
+DEFAULT_VALUES = {
+    'int' : 0,
+    'float' : 0.0,
+    'string' : "",
+    'bool' : False
+}
+
 class MemorySegment():
     """Represents a memory that is divided in type segments"""
 
@@ -11,6 +19,10 @@ class MemorySegment():
         self.initial_address = initial_address
         self.final_address= initial_address + total_addresses - 1
 
+        # The values of all the type segments live in a single list, the
+        # position of an address is its distance from the initial address
+        self.values = [None] * total_addresses
+
         # Calculates the initial and final addresses for each type segment
         self.int_initial_address = initial_address
         self.int_final_address = initial_address + self.type_segment_size - 1
@@ -23,93 +35,66 @@ class MemorySegment():
 
         # Creates the type segments
         self.int_segment = TypeSegment('Integer', self.int_initial_address,
-            self.int_final_address)
+            self.int_final_address, self.values, 0)
         self.float_segment = TypeSegment('Float', self.float_initial_address,
-            self.float_final_address)
+            self.float_final_address, self.values, self.type_segment_size)
         self.string_segment = TypeSegment('String', self.string_initial_address,
-            self.string_final_address)
+            self.string_final_address, self.values, self.type_segment_size * 2)
         self.bool_segment = TypeSegment('Boolean', self.bool_initial_address,
-            self.bool_final_address)
+            self.bool_final_address, self.values, self.type_segment_size * 3)
+
+        # Type of each type segment in the order they are placed
+        self.segment_types = ['int', 'float', 'string', 'bool']
+
+    def contains(self, address):
+        """Checks if an operand is an address of the segment"""
+        return (isinstance(address, int) and self.initial_address <= address
+            <= self.final_address)
 
     def request_address(self, segment_type, value=None):
         """Requests an address according of the type"""
+        if value is None:
+            value = DEFAULT_VALUES[segment_type]
+
         if segment_type == 'int':
-            if value is None:
-                value = 0
             return self.int_segment.request_address(value)
         elif segment_type == 'float':
-            if value is None:
-                value = 0.0
             return self.float_segment.request_address(value)
         elif segment_type == 'string':
-            if value is None:
-                value = ""
             return self.string_segment.request_address(value)
         elif segment_type == 'bool':
-            if value is None:
-                value = False
             return self.bool_segment.request_address(value)
 
     def request_sequential_addresses(self, segment_type, total_addresses, value=None):
         """Requests a bunch of addresses according of the type"""
+        if value is None:
+            value = DEFAULT_VALUES[segment_type]
+
         if segment_type == 'int':
-            if value is None:
-                value = 0
             return self.int_segment.request_sequential_addresses(total_addresses, value)
         elif segment_type == 'float':
-            if value is None:
-                value = 0.0
             return self.float_segment.request_sequential_addresses(total_addresses, value)
         elif segment_type == 'string':
-            if value is None:
-                value = ""
             return self.string_segment.request_sequential_addresses(total_addresses, value)
         elif segment_type == 'bool':
-            if value is None:
-                value = False
             return self.bool_segment.request_sequential_addresses(total_addresses, value)
 
     def determines_segment_tpye(self, address):
         """Returns the type of the segment according of the address"""
-        if (address >= self.int_initial_address and address <=
-            self.int_final_address):
-            return 'int'
-        elif (address >= self.float_initial_address and address <=
-            self.float_final_address):
-            return 'float'
-        elif (address >= self.string_initial_address and address <=
-            self.string_final_address):
-            return 'string'
-        elif (address >= self.bool_initial_address and address <=
-            self.bool_final_address):
-            return 'bool'
+        if address >= self.initial_address and address <= self.final_address:
+            return self.segment_types[(address - self.initial_address) //
+                self.type_segment_size]
         else:
             print("Invalid address in the " + self.name + " memory")
             sys.exit()
 
     def get_value(self, address):
         """Returns a value according of the address"""
-        segment_type = self.determines_segment_tpye(address)
-        if segment_type == 'int':
-            return self.int_segment.get_value(address)
-        elif segment_type == 'float':
-            return self.float_segment.get_value(address)
-        elif segment_type == 'string':
-            return self.string_segment.get_value(address)
-        elif segment_type == 'bool':
-            return self.bool_segment.get_value(address)
+        return self.values[address - self.initial_address]
 
     def edit_value(self, address, value):
         """Edits the value related to an address"""
-        segment_type = self.determines_segment_tpye(address)
-        if segment_type == 'int':
-            self.int_segment.edit_value(address, value)
-        elif segment_type == 'float':
-            self.float_segment.edit_value(address, value)
-        elif segment_type == 'string':
-            self.string_segment.edit_value(address, value)
-        elif segment_type =='bool':
-            self.bool_segment.edit_value(address, value)
+        self.values[address - self.initial_address] = value
 
     def check_existing_value(self, segment_type, value):
         """Checks if the value exists in the segment"""
@@ -122,6 +107,17 @@ class MemorySegment():
         elif segment_type =='bool':
             return self.bool_segment.check_existing_value(value)
 
+    def has_available_space(self, segment_type):
+        """Determines if an address of the type can still be requested"""
+        if segment_type == 'int':
+            return self.int_segment.available_space()
+        elif segment_type == 'float':
+            return self.float_segment.available_space()
+        elif segment_type == 'string':
+            return self.string_segment.available_space()
+        elif segment_type =='bool':
+            return self.bool_segment.available_space()
+
     def reset_memory(self):
         """Resets the segment, clears all the addresses used"""
         self.int_segment.reset()
@@ -0,0 +1,94 @@
+# Operators of the quadruples the virtual machine knows how to execute, the
+# position of each operator in the list is its integer opcode
+OPERATORS = [
+    # Arithmetic, relational and logical operations
+    '+', '-', '*', '/', '=', '>', '<', '>=', '<=', '==', '!=', 'and', 'or',
+
+    # Input and output
+    'PRINT', 'READ',
+
+    # Jumps, array boundaries and procedure calls
+    'GOTO', 'GOTOF', 'GOTOT', 'VERF_INDEX', 'RETURN', 'ERA', 'PARAMETER', 'GOSUB', 'ENDPROC',
+
+    # Relational operations fused with the GOTOF that reads their result
+    'GOTOF_GT', 'GOTOF_LT', 'GOTOF_GE', 'GOTOF_LE', 'GOTOF_EQ', 'GOTOF_NE',
+
+    # Predefined turtle functions
+    'CREATE_TURTLE', 'RESET', 'FINISH_DRAWING', 'PEN_UP', 'PEN_DOWN',
+    'BEGIN_FILL', 'END_FILL', 'PEN_COLOR', 'FILL_COLOR', 'PEN_WIDTH',
+    'MOVE_FORWARD', 'MOVE_RIGHT', 'MOVE_LEFT', 'TURN_RIGHT', 'TURN_LEFT',
+    'DRAW_SQUARE', 'DRAW_TRIANGLE', 'DRAW_CIRCLE', 'DRAW_RECTANGLE',
+    'SET_POSITION', 'SET_SPEED'
+]
+
+# Maps each operator to its integer opcode
+OPCODES = {operator : opcode for opcode, operator in enumerate(OPERATORS)}
+
+# Maps each relational operator to the conditional jump that compares its
+# operands and jumps when the comparison is false
+FUSED_BRANCHES = {
+    '>' : 'GOTOF_GT',
+    '<' : 'GOTOF_LT',
+    '>=' : 'GOTOF_GE',
+    '<=' : 'GOTOF_LE',
+    '==' : 'GOTOF_EQ',
+    '!=' : 'GOTOF_NE'
+}
+
+# Role of the left operand, the right operand and the result of each operator:
+# 'address' is an address that is read, 'store' an address that is written,
+# 'jump' the number of a quadruple, 'function' the name of a function, 'value'
+# is used as it is and None means the operand is empty
+OPERAND_ROLES = {
+    '+' : ('address', 'address', 'store'),
+    '-' : ('address', 'address', 'store'),
+    '*' : ('address', 'address', 'store'),
+    '/' : ('address', 'address', 'store'),
+    '=' : ('address', None, 'store'),
+    '>' : ('address', 'address', 'store'),
+    '<' : ('address', 'address', 'store'),
+    '>=' : ('address', 'address', 'store'),
+    '<=' : ('address', 'address', 'store'),
+    '==' : ('address', 'address', 'store'),
+    '!=' : ('address', 'address', 'store'),
+    'and' : ('address', 'address', 'store'),
+    'or' : ('address', 'address', 'store'),
+    'PRINT' : ('address', None, None),
+    'READ' : ('value', 'address', 'store'),
+    'GOTO' : (None, None, 'jump'),
+    'GOTOF' : ('address', None, 'jump'),
+    'GOTOT' : ('address', None, 'jump'),
+    'VERF_INDEX' : ('address', 'value', 'value'),
+    'RETURN' : ('address', None, 'store'),
+    'ERA' : ('function', None, None),
+    'PARAMETER' : ('address', None, None),
+    'GOSUB' : ('function', None, 'jump'),
+    'ENDPROC' : (None, None, None),
+    'GOTOF_GT' : ('address', 'address', 'jump'),
+    'GOTOF_LT' : ('address', 'address', 'jump'),
+    'GOTOF_GE' : ('address', 'address', 'jump'),
+    'GOTOF_LE' : ('address', 'address', 'jump'),
+    'GOTOF_EQ' : ('address', 'address', 'jump'),
+    'GOTOF_NE' : ('address', 'address', 'jump'),
+    'CREATE_TURTLE' : (None, None, None),
+    'RESET' : (None, None, None),
+    'FINISH_DRAWING' : (None, None, None),
+    'PEN_UP' : (None, None, None),
+    'PEN_DOWN' : (None, None, None),
+    'BEGIN_FILL' : (None, None, None),
+    'END_FILL' : (None, None, None),
+    'PEN_COLOR' : ('address', None, None),
+    'FILL_COLOR' : ('address', None, None),
+    'PEN_WIDTH' : ('address', None, None),
+    'MOVE_FORWARD' : ('address', None, None),
+    'MOVE_RIGHT' : ('address', None, None),
+    'MOVE_LEFT' : ('address', None, None),
+    'TURN_RIGHT' : ('address', None, None),
+    'TURN_LEFT' : ('address', None, None),
+    'DRAW_SQUARE' : ('address', None, None),
+    'DRAW_TRIANGLE' : ('address', None, None),
+    'DRAW_CIRCLE' : ('address', None, None),
+    'DRAW_RECTANGLE' : ('address', 'address', None),
+    'SET_POSITION' : ('address', 'address', None),
+    'SET_SPEED' : ('address', None, None)
+}
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+import ply.yacc as yacc
+
+# Version of the cached tables, the tables cached by other versions are not used
+PARSER_CACHE_VERSION = '1'
+
+class ParserCache():
+    """Builds the parser of a grammar from LALR tables cached on disk. The
+    tables are kept in a directory of the version of PLY and of the cache, in
+    a file named after the signature of the grammar, so they are generated
+    again only when the rules, the tokens or the precedence change"""
+
+    def __init__(self, grammar, cache_directory):
+        """Class constructor"""
+        self.grammar = grammar
+        self.cache_directory = os.path.join(cache_directory, 'parser-' + yacc.__tabversion__
+            + '-' + PARSER_CACHE_VERSION)
+        self.table_path = None
+        self.build_time = None
+        self.generated = False
+
+    def get_table_path(self):
+        """Returns the file the tables of the grammar are cached in"""
+        if self.table_path is None:
+            grammar_dictionary = dict((name, getattr(self.grammar, name))
+                for name in dir(self.grammar))
+            grammar_information = yacc.ParserReflect(grammar_dictionary, log=yacc.NullLogger())
+            grammar_information.get_all()
+
+            # The signature of PLY has the rules, the names of the functions
+            # that reduce them are added because the tables refer to them
+            rule_names = [rule[2] for rule in grammar_information.pfuncs]
+            key = hashlib.sha256('\0'.join([grammar_information.signature()]
+                + rule_names).encode()).hexdigest()
+            self.table_path = os.path.join(self.cache_directory, key + '.pickle')
+        return self.table_path
+
+    def build_parser(self):
+        """Returns the parser of the grammar, its tables come from the cache
+        and are generated and saved in it when they are not there"""
+        start_time = time.perf_counter()
+        table_path = self.get_table_path()
+        parser = None
+
+        if os.path.exists(table_path):
+            try:
+                # The signature is already part of the file name, so the one
+                # in the file is not checked
+                parser = yacc.yacc(module=self.grammar, debug=False, optimize=True,
+                    write_tables=False, picklefile=table_path)
+            except (EOFError, ValueError, TypeError, KeyError, pickle.UnpicklingError):
+                # A damaged table file is generated again
+                pass
+
+        self.generated = parser is None
+        if self.generated:
+            try:
+                os.makedirs(self.cache_directory, exist_ok=True)
+                temporal_path = (table_path + '.' + str(os.getpid()) + '.'
+                    + str(threading.get_ident()))
+            except OSError:
+                # The tables are not cached when the directory can't be written
+                temporal_path = None
+            parser = yacc.yacc(module=self.grammar, debug=False, write_tables=False,
+                picklefile=temporal_path)
+            if temporal_path is not None and os.path.exists(temporal_path):
+                os.replace(temporal_path, table_path)
+
+        self.build_time = time.perf_counter() - start_time
+        return parser
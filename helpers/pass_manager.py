@@ -0,0 +1,200 @@
+import sys
+import time
+
+from .bounds_check_eliminator import BoundsCheckEliminator
+from .common_subexpression_eliminator import CommonSubexpressionEliminator
+from .constant_folder import ConstantFolder
+from .copy_propagator import CopyPropagator
+from .dead_code_eliminator import DeadCodeEliminator
+from .function_inliner import FunctionInliner, INLINING_SIZE_BUDGET
+from .induction_variable_reducer import InductionVariableReducer
+from .loop_invariant_mover import LoopInvariantMover
+from .opcodes import OPERAND_ROLES
+from .peephole_optimizer import PeepholeOptimizer
+from .ssa_form import SSAForm
+from .tail_call_eliminator import TailCallEliminator
+from .temporal_allocator import TemporalAllocator
+
+# Class of every pass, the constructor of each one receives the program
+PASSES = {
+    'inline' : FunctionInliner,
+    'fold' : ConstantFolder,
+    'cse' : CommonSubexpressionEliminator,
+    'copy' : CopyPropagator,
+    'dce' : DeadCodeEliminator,
+    'tail-calls' : TailCallEliminator,
+    'licm' : LoopInvariantMover,
+    'induction' : InductionVariableReducer,
+    'peephole' : PeepholeOptimizer,
+    'bounds' : BoundsCheckEliminator,
+    'ssa' : SSAForm,
+    'temporals' : TemporalAllocator
+}
+
+# Passes run by each optimization level in the order they run. The first
+# level only works inside the blocks of a function, the second one also
+# rewrites calls and loops
+OPTIMIZATION_PIPELINES = {
+    0 : [],
+    1 : ['fold', 'cse', 'copy', 'dce', 'peephole', 'temporals'],
+    2 : ['inline', 'fold', 'cse', 'copy', 'dce', 'tail-calls', 'licm', 'induction',
+        'peephole', 'bounds', 'temporals']
+}
+
+class PassManager():
+    """Runs an ordered list of passes over the quadruples and the function
+    directory of a program, measuring the time each one takes and how the
+    number of quadruples changes"""
+
+    def __init__(self, program, inline_budget=INLINING_SIZE_BUDGET, verify=False):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.function_directory = program.function_directory
+        self.inline_budget = inline_budget
+        self.verify = verify
+        self.passes = []
+        self.statistics = []
+
+    def add_pass(self, pass_name):
+        """Adds a pass at the end of the pipeline"""
+        if pass_name not in PASSES:
+            print("Unknown pass: " + str(pass_name))
+            sys.exit()
+        self.passes.append(pass_name)
+
+    def add_optimization_level(self, optimization_level):
+        """Adds the passes of an optimization level at the end of the pipeline"""
+        if optimization_level not in OPTIMIZATION_PIPELINES:
+            print("Unknown optimization level: " + str(optimization_level))
+            sys.exit()
+        for pass_name in OPTIMIZATION_PIPELINES[optimization_level]:
+            self.add_pass(pass_name)
+
+    def make_pass(self, pass_name):
+        """Returns the object that runs a pass over the program"""
+        if pass_name == 'inline':
+            return FunctionInliner(self.program, self.inline_budget)
+        else:
+            return PASSES[pass_name](self.program)
+
+    def run(self):
+        """Runs every pass of the pipeline in order, returns the statistics of
+        each one"""
+        if self.verify:
+            self.verify_program('parse')
+
+        for pass_name in self.passes:
+            quadruples_before = len(self.program.quadruple_list)
+            start_time = time.perf_counter()
+            changes = self.make_pass(pass_name).optimize()
+            elapsed_time = time.perf_counter() - start_time
+
+            self.statistics.append({
+                'name' : pass_name,
+                'time' : elapsed_time,
+                'changes' : changes,
+                'quadruples_before' : quadruples_before,
+                'quadruples_after' : len(self.program.quadruple_list)
+            })
+            if self.verify:
+                self.verify_program(pass_name)
+
+        return self.statistics
+
+    def print_statistics(self):
+        """Prints the time, the changes and the quadruples of every pass run"""
+        print('{:<12}{:>10}{:>10}{:>12}{:>8}'.format('Pass', 'Time (ms)', 'Changes',
+            'Quadruples', 'Delta'))
+        total_time = 0
+        for statistics in self.statistics:
+            delta = statistics['quadruples_after'] - statistics['quadruples_before']
+            print('{:<12}{:>10.3f}{:>10}{:>12}{:>+8}'.format(statistics['name'],
+                statistics['time'] * 1000, statistics['changes'],
+                statistics['quadruples_after'], delta))
+            total_time += statistics['time']
+        print('{:<12}{:>10.3f}{:>10}{:>12}'.format('Total', total_time * 1000, '',
+            len(self.program.quadruple_list)))
+
+    def verify_program(self, pass_name):
+        """Checks that the quadruples left by a pass can be executed, stops the
+        compilation with the first problem found"""
+        quadruple_list = self.program.quadruple_list
+        function_list = self.function_directory.function_list
+
+        # Every function starts at a quadruple of the list
+        function_starts = {}
+        for function_name, function in function_list.items():
+            quadruple_number = function['quadruple_number']
+            if quadruple_number > 0:
+                if quadruple_number > len(quadruple_list):
+                    self.report_error(pass_name, "function " + function_name
+                        + " starts after the last quadruple")
+                function_starts[quadruple_number] = function
+
+        function = None
+        for position, quadruple in enumerate(quadruple_list):
+            quadruple_number = position + 1
+            function = function_starts.get(quadruple_number, function)
+            if quadruple.operator not in OPERAND_ROLES:
+                self.report_error(pass_name, "unknown operator", quadruple)
+
+            operands = [quadruple.left_operand, quadruple.right_operand, quadruple.result]
+            for role, operand in zip(OPERAND_ROLES[quadruple.operator], operands):
+                error = self.verify_operand(role, operand, function, quadruple_list)
+                if error is not None:
+                    self.report_error(pass_name, error, quadruple)
+
+            if (quadruple.operator == 'GOSUB' and quadruple.left_operand in function_list
+                    and function_list[quadruple.left_operand]['quadruple_number'] != quadruple.result):
+                self.report_error(pass_name, "call doesn't jump to the start of its function",
+                    quadruple)
+
+    def verify_operand(self, role, operand, function, quadruple_list):
+        """Returns the problem of an operand given the role its operator gives
+        it, None when it has none"""
+        if isinstance(operand, dict):
+            operand = operand['index_address']
+            role = 'address'
+
+        if role == 'jump':
+            if not isinstance(operand, int) or not 1 <= operand <= len(quadruple_list) + 1:
+                return "jump out of the quadruples: " + str(operand)
+        elif role == 'function':
+            if operand not in self.function_directory.function_list:
+                return "unknown function: " + str(operand)
+        elif role == 'address' or role == 'store':
+            if not isinstance(operand, int):
+                return "invalid address: " + str(operand)
+            elif role == 'store' and self.memory.constant_memory.contains(operand):
+                return "constant written: " + str(operand)
+            elif self.memory.local_memory.contains(operand):
+                return self.verify_frame_address(operand, self.memory.local_memory,
+                    function, 'number_of_local_variables')
+            elif self.memory.temporal_memory.contains(operand):
+                return self.verify_frame_address(operand, self.memory.temporal_memory,
+                    function, 'number_of_temporal_variables')
+            elif not (self.memory.global_memory.contains(operand)
+                    or self.memory.constant_memory.contains(operand)):
+                return "invalid address: " + str(operand)
+        return None
+
+    def verify_frame_address(self, address, memory_segment, function, counter_name):
+        """Returns a problem if a local or temporal address is not in the frame
+        of the function whose quadruples use it, None otherwise"""
+        if function is None:
+            return "frame address outside a function: " + str(address)
+        type_segment_size = memory_segment.type_segment_size
+        offset = address - memory_segment.initial_address
+        address_type = memory_segment.segment_types[offset // type_segment_size]
+        if offset % type_segment_size >= function[counter_name][address_type]:
+            return "address outside the frame of " + function['name'] + ": " + str(address)
+        return None
+
+    def report_error(self, pass_name, error, quadruple=None):
+        """Prints a problem found after a pass and stops the compilation"""
+        message = "Verification failed after " + pass_name + ": " + error
+        if quadruple is not None:
+            message += " (" + str(quadruple) + ")"
+        print(message)
+        sys.exit()
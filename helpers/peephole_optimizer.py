@@ -0,0 +1,55 @@
+from .opcodes import FUSED_BRANCHES
+from .quadruple_editor import QuadrupleEditor
+
+class PeepholeOptimizer():
+    """Replaces short sequences of quadruples with cheaper ones"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+
+    def optimize(self):
+        """Applies every rewrite to the quadruples of the program, returns the
+        number of rewrites made"""
+        return self.fuse_conditional_jumps()
+
+    def fuse_conditional_jumps(self):
+        """Fuses a relational operation with the GOTOF that reads its result
+        into a single conditional jump, returns the number of jumps fused"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        jump_targets = editor.get_jump_targets()
+
+        fused_jumps = 0
+        for function_name, start, end in editor.get_function_quadruples():
+            function_quadruples = quadruple_list[start:end]
+
+            # Number of quadruples of the function that read each address, the
+            # temporal addresses are reused by every function
+            address_uses = {}
+            for quadruple in function_quadruples:
+                for address in quadruple.get_used_addresses():
+                    address_uses[address] = address_uses.get(address, 0) + 1
+
+            for relational, jump in zip(function_quadruples, function_quadruples[1:]):
+                # The result of the relational operation must be a temporal only
+                # the GOTOF reads, not an element of a dimensioned variable, and
+                # the GOTOF can't be reached by other jump
+                if (relational.operator in FUSED_BRANCHES and jump.operator == 'GOTOF'
+                        and not editor.is_removed(relational)
+                        and isinstance(relational.result, int)
+                        and jump.left_operand == relational.result
+                        and self.memory.determines_memory_type(relational.result) == 'temporal'
+                        and address_uses[relational.result] == 1
+                        and id(jump) not in jump_targets):
+                    jump.operator = FUSED_BRANCHES[relational.operator]
+                    jump.left_operand = relational.left_operand
+                    jump.right_operand = relational.right_operand
+
+                    # The jumps to the relational operation go to the fused jump
+                    editor.remove(relational)
+                    fused_jumps += 1
+
+        editor.close()
+        return fused_jumps
@@ -15,7 +15,7 @@ class Program():
         self.temporal_variables = []
         self.temporal_parameters_names = []
         self.temporal_parameters_types = []
-        self.temporal_arguments_types = []
+        self.temporal_arguments_types = [] # A list of types for each call being parsed
         self.operand_stack = []
         self.type_stack = []
         self.operator_stack = []
@@ -31,6 +31,21 @@ class Program():
         self.dimensioned_varible_flag = False
         self.negation_stack = []
 
+    def request_function_temporal(self, function_name, temporal_type):
+        """Returns a temporal address no quadruple of a function uses yet, None
+        when its type segment is full. The temporals of every function start
+        at the first address of their type segment"""
+        temporal_memory = self.memory.temporal_memory
+        function = self.function_directory.function_list[function_name]
+        number_of_temporals = function['number_of_temporal_variables'][temporal_type]
+        if number_of_temporals >= temporal_memory.type_segment_size:
+            return None
+
+        type_number = temporal_memory.segment_types.index(temporal_type)
+        self.function_directory.add_temporal_to_function(function_name, temporal_type)
+        return (temporal_memory.initial_address + type_number * temporal_memory.type_segment_size
+            + number_of_temporals)
+
     def print_stacks(self):
         """Print the temporal stacks of  the program"""
         print(self.operand_stack)
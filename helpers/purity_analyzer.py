@@ -0,0 +1,100 @@
+from .control_flow_graph import ControlFlowGraph
+from .quadruple_editor import QuadrupleEditor
+
+# Operators a pure function may execute, the functions it calls must be pure too
+PURE_FUNCTION_OPERATORS = ['+', '-', '*', '/', '=', '>', '<', '>=', '<=', '==', '!=',
+    'and', 'or', 'RETURN', 'GOTO', 'GOTOF', 'GOTOT', 'GOTOF_GT', 'GOTOF_LT', 'GOTOF_GE',
+    'GOTOF_LE', 'GOTOF_EQ', 'GOTOF_NE', 'VERF_INDEX', 'ERA', 'PARAMETER', 'GOSUB',
+    'ENDPROC']
+
+class PurityAnalyzer():
+    """Finds the functions whose result only depends on their arguments, they
+    don't read or write global or dimensioned variables, print, read or draw,
+    so a call can be answered with the result of a previous one"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.function_list = program.function_directory.function_list
+
+        # The functions write their result in a global address that the
+        # caller reads right after the call
+        self.return_addresses = set(function['return_address']
+            for function in self.function_list.values())
+
+    def is_private_address(self, address):
+        """Checks if an address is a variable of the frame, a constant or the
+        return address of a function"""
+        return (self.memory.local_memory.contains(address)
+            or self.memory.temporal_memory.contains(address)
+            or self.memory.constant_memory.contains(address)
+            or address in self.return_addresses)
+
+    def analyze(self):
+        """Sets the purity flag of every function, returns the number of pure
+        functions"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        functions = {function_name : quadruple_list[start:end] for function_name, start, end
+            in editor.get_function_quadruples()}
+
+        pure_functions = set(function_name for function_name, quadruples in functions.items()
+            if self.is_pure_body(function_name, quadruples))
+
+        # A function that calls an impure function is impure too
+        changed = True
+        while changed:
+            changed = False
+            for function_name in list(pure_functions):
+                if any(quadruple.operator == 'GOSUB' and quadruple.left_operand not in pure_functions
+                        for quadruple in functions[function_name]):
+                    pure_functions.discard(function_name)
+                    changed = True
+
+        editor.close()
+        for function_name, function in self.function_list.items():
+            function['pure'] = function_name in pure_functions
+        return len(pure_functions)
+
+    def is_pure_body(self, function_name, quadruples):
+        """Checks if the quadruples of a function only work with its frame, the
+        functions it calls are checked apart"""
+        function = self.function_list[function_name]
+        if function['return_type'] == 'void' or quadruples[-1].operator != 'ENDPROC':
+            return False
+
+        for quadruple in quadruples:
+            if quadruple.operator not in PURE_FUNCTION_OPERATORS:
+                return False
+            operands = [quadruple.left_operand, quadruple.right_operand, quadruple.result]
+            if any(isinstance(operand, dict) for operand in operands):
+                return False
+            addresses = quadruple.get_used_addresses() + [quadruple.get_stored_address()]
+            if any(address is not None and not self.is_private_address(address)
+                    for address in addresses):
+                return False
+
+        return self.always_returns(quadruples, function['return_address'])
+
+    def always_returns(self, quadruples, return_address):
+        """Checks if every path of a function writes its return address before
+        ending, otherwise its result would be the one left by another call"""
+        control_flow_graph = ControlFlowGraph(quadruples)
+        visited_blocks = set()
+        pending_blocks = [0]
+        while pending_blocks:
+            block_number = pending_blocks.pop()
+            if block_number in visited_blocks:
+                continue
+            visited_blocks.add(block_number)
+            returns = False
+            for quadruple in control_flow_graph.blocks[block_number]:
+                if quadruple.get_stored_address() == return_address:
+                    returns = True
+                    break
+                elif quadruple.operator == 'ENDPROC':
+                    return False
+            if not returns:
+                pending_blocks.extend(control_flow_graph.successors[block_number])
+        return True
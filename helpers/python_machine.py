@@ -0,0 +1,394 @@
+from .linker import INDIRECT, FRAME
+from .memory import GLOBAL_SEGMENT, LOCAL_SEGMENT, CONSTANT_SEGMENT, TEMPORAL_SEGMENT
+from .opcodes import OPERATORS, FUSED_BRANCHES
+from .virtual_machine import VirtualMachine
+
+import hashlib
+import marshal
+import math
+import os
+import sys
+import threading
+import turtle
+
+# Version of the generated code, the code cached by other versions is not used
+BACKEND_VERSION = '1'
+
+# Calls of the program that can be nested, every call of a function is a call
+# of a Python function. Since Python 3.11 the calls between Python functions
+# don't use the stack of the interpreter, older versions keep their limit
+CALL_DEPTH_LIMIT = 1000000
+
+# Python operator of each operation of two operands
+BINARY_OPERATORS = {
+    '+' : '+', '-' : '-', '*' : '*', '>' : '>', '<' : '<', '>=' : '>=',
+    '<=' : '<=', '==' : '==', '!=' : '!=', 'and' : 'and', 'or' : 'or'
+}
+
+# Python operator of the comparison of each fused conditional jump
+CONDITIONAL_JUMP_OPERATORS = {jump : relational for relational, jump in FUSED_BRANCHES.items()}
+
+# Lines of Python code of each turtle instruction
+TURTLE_STATEMENTS = {
+    'CREATE_TURTLE' : ['machine.current_turtle = turtle.Turtle()'],
+    'RESET' : ['machine.current_turtle.reset()'],
+    'FINISH_DRAWING' : ['turtle.done()'],
+    'PEN_UP' : ['machine.current_turtle.penup()'],
+    'PEN_DOWN' : ['machine.current_turtle.pendown()'],
+    'BEGIN_FILL' : ['machine.current_turtle.begin_fill()'],
+    'END_FILL' : ['machine.current_turtle.end_fill()'],
+    'PEN_COLOR' : ['machine.current_turtle.pencolor({left}[1:-1])'],
+    'FILL_COLOR' : ['machine.current_turtle.fillcolor({left}[1:-1])'],
+    'PEN_WIDTH' : ['machine.current_turtle.width({left})'],
+    'MOVE_FORWARD' : ['machine.current_turtle.forward(int({left}))'],
+    'MOVE_RIGHT' : ['machine.current_turtle.right(90)',
+        'machine.current_turtle.forward({left})'],
+    'MOVE_LEFT' : ['machine.current_turtle.left(90)',
+        'machine.current_turtle.forward({left})'],
+    'TURN_RIGHT' : ['machine.current_turtle.right({left})'],
+    'TURN_LEFT' : ['machine.current_turtle.left({left})'],
+    'DRAW_SQUARE' : ['for side in range(4):',
+        '    machine.current_turtle.forward({left})',
+        '    machine.current_turtle.right(90)'],
+    'DRAW_TRIANGLE' : ['for side in range(3):',
+        '    machine.current_turtle.forward({left})',
+        '    machine.current_turtle.left(120)'],
+    'DRAW_CIRCLE' : ['machine.current_turtle.circle({left})'],
+    'DRAW_RECTANGLE' : ['for side in range(2):',
+        '    machine.current_turtle.forward({left})',
+        '    machine.current_turtle.right(90)',
+        '    machine.current_turtle.forward({right})',
+        '    machine.current_turtle.right(90)'],
+    'SET_POSITION' : ['machine.current_turtle.setposition({left}, {right})'],
+    'SET_SPEED' : ['machine.current_turtle.speed({left})']
+}
+
+class PythonMachine(VirtualMachine):
+    """Executes the program as Python code, every function of the program is
+    translated into a Python function whose variables are Python locals"""
+
+    def __init__(self, memory, function_directory, instructions, memoize=True,
+            source_code=None, cache_directory=None):
+        """Class constructor"""
+        super().__init__(memory, function_directory, instructions, memoize)
+        self.source_code = source_code
+        self.cache_directory = cache_directory
+
+    def get_address_value(self, address):
+        """Returns the value of an address a dimensioned variable refers to"""
+        segment, slot = self.memory.locate_address(address)
+        if segment == LOCAL_SEGMENT or segment == TEMPORAL_SEGMENT:
+            print("The address " + str(address) + " can't be referred by a dimensioned variable")
+            sys.exit()
+        return self.segment_values[segment][slot]
+
+    def set_address_value(self, address, value):
+        """Edits the value of an address a dimensioned variable refers to"""
+        segment, slot = self.memory.locate_address(address)
+        if segment == LOCAL_SEGMENT or segment == TEMPORAL_SEGMENT:
+            print("The address " + str(address) + " can't be referred by a dimensioned variable")
+            sys.exit()
+        self.segment_values[segment][slot] = value
+
+    def divide(self, left_operand, right_operand):
+        """Divides two operands"""
+        if right_operand == 0:
+            print("ERROR: Divisions by 0 are not allowed")
+            sys.exit()
+
+        # Exact division if a float is involved
+        if isinstance(left_operand, float) or isinstance(right_operand, float):
+            return left_operand / right_operand
+        else:
+            return int(left_operand / right_operand)
+
+    def verify_index(self, index, lower_limit, upper_limit):
+        """Verifies the index of a dimensioned variable is inside its boundaries"""
+        if not (index >= lower_limit and index < upper_limit):
+            print("Index out of bound")
+            sys.exit()
+
+    def read_input(self, variable_type, message):
+        """Reads a value from the user, its type must be the one of the variable"""
+        input_value = input(str(message) + "\n")
+        input_value_type = self.get_string_input_type(input_value)
+        input_value = self.set_input_type(input_value)
+
+        # Assigns only if the types of the input and the variable match
+        if input_value_type == variable_type:
+            return input_value
+        else:
+            print("Input type mismatch")
+            sys.exit()
+
+    def get_operand_source(self, operand):
+        """Returns the Python expression that reads a linked operand"""
+        segment, slot = operand
+        if segment == FRAME:
+            return 'v' + str(slot)
+        elif segment == INDIRECT:
+            return 'get_address_value(' + self.get_operand_source(slot) + ')'
+        elif segment == CONSTANT_SEGMENT:
+            # Constants are written as literals, except the floats that have none
+            value = self.segment_values[segment][slot]
+            if isinstance(value, float) and not math.isfinite(value):
+                return 'constant_values[' + str(slot) + ']'
+            return repr(value)
+        elif segment == GLOBAL_SEGMENT:
+            return 'global_values[' + str(slot) + ']'
+        else:
+            return 'segment_values[' + str(segment) + '][' + str(slot) + ']'
+
+    def get_store_source(self, operand, value_source):
+        """Returns the Python statement that edits a linked operand"""
+        segment, slot = operand
+        if segment == INDIRECT:
+            return ('set_address_value(' + self.get_operand_source(slot) + ', ' +
+                value_source + ')')
+        else:
+            return self.get_operand_source(operand) + ' = ' + value_source
+
+    def get_jump_source(self, instruction_number, labels):
+        """Returns the Python statements that jump to an instruction"""
+        if instruction_number in labels:
+            return ['label = ' + str(labels[instruction_number]), 'continue']
+        elif instruction_number == self.number_of_instructions:
+            # Jumping after the last instruction ends the program
+            return ['return']
+        else:
+            print("The instruction " + str(instruction_number) + " can't be reached " +
+                "from the function that jumps to it")
+            sys.exit()
+
+    def generate_instruction(self, operator, instruction, labels, calls):
+        """Returns the lines of Python code of an instruction"""
+        opcode, left_operand_address, right_operand_address, result_address = instruction
+
+        if operator in BINARY_OPERATORS:
+            return [self.get_store_source(result_address, '(' +
+                self.get_operand_source(left_operand_address) + ' ' +
+                BINARY_OPERATORS[operator] + ' ' +
+                self.get_operand_source(right_operand_address) + ')')]
+        elif operator == '/':
+            return [self.get_store_source(result_address, 'divide(' +
+                self.get_operand_source(left_operand_address) + ', ' +
+                self.get_operand_source(right_operand_address) + ')')]
+        elif operator == '=' or operator == 'RETURN':
+            return [self.get_store_source(result_address,
+                self.get_operand_source(left_operand_address))]
+        elif operator == 'GOTO':
+            return self.get_jump_source(result_address, labels)
+        elif operator == 'GOTOF':
+            condition = self.get_operand_source(left_operand_address)
+            return (['if not ' + condition + ':'] +
+                ['    ' + line for line in self.get_jump_source(result_address, labels)])
+        elif operator == 'GOTOT':
+            condition = self.get_operand_source(left_operand_address)
+            return (['if ' + condition + ':'] +
+                ['    ' + line for line in self.get_jump_source(result_address, labels)])
+        elif operator in CONDITIONAL_JUMP_OPERATORS:
+            condition = (self.get_operand_source(left_operand_address) + ' ' +
+                CONDITIONAL_JUMP_OPERATORS[operator] + ' ' +
+                self.get_operand_source(right_operand_address))
+            return (['if not (' + condition + '):'] +
+                ['    ' + line for line in self.get_jump_source(result_address, labels)])
+        elif operator == 'VERF_INDEX':
+            return ['verify_index(' + self.get_operand_source(left_operand_address) + ', ' +
+                repr(right_operand_address) + ', ' + repr(result_address) + ')']
+        elif operator == 'ERA':
+            calls.append([])
+            return []
+        elif operator == 'PARAMETER':
+            # Arguments are evaluated where they are passed, before the call
+            argument = 'argument_' + str(len(calls)) + '_' + str(len(calls[-1]))
+            calls[-1].append(argument)
+            return [argument + ' = ' + self.get_operand_source(left_operand_address)]
+        elif operator == 'GOSUB':
+            arguments = calls.pop()
+            return ['function_' + left_operand_address['name'] + '(' +
+                ', '.join(arguments) + ')']
+        elif operator == 'ENDPROC':
+            return ['return']
+        elif operator == 'PRINT':
+            return ['print(str(' + self.get_operand_source(left_operand_address) + '))']
+        elif operator == 'READ':
+            return [self.get_store_source(result_address, 'read_input(' +
+                repr(left_operand_address) + ', ' +
+                self.get_operand_source(right_operand_address) + ')')]
+        else:
+            left_source = right_source = None
+            if left_operand_address is not None:
+                left_source = self.get_operand_source(left_operand_address)
+            if right_operand_address is not None:
+                right_source = self.get_operand_source(right_operand_address)
+            return [line.format(left=left_source, right=right_source)
+                for line in TURTLE_STATEMENTS[operator]]
+
+    def generate_function(self, function, start, end, print_step_by_step):
+        """Returns the lines of the Python function of a function, its
+        instructions go from start to end"""
+        # Parameters receive the arguments, the rest of the frame starts with
+        # its initial values
+        parameter_slots = [self.linker.resolve_frame_slot(function, address)
+            for address in function['parameters']['addresses']]
+        lines = ['def function_' + function['name'] + '(' +
+            ', '.join('v' + str(slot) for slot in parameter_slots) + '):']
+        lines.append('    global_values = segment_values[' + str(GLOBAL_SEGMENT) + ']')
+        for slot, value in enumerate(function['frame_values']):
+            if slot not in parameter_slots:
+                lines.append('    v' + str(slot) + ' = ' + repr(value))
+
+        # Every instruction other instructions jump to starts a block, the label
+        # of the block says where the execution continues
+        labels = {start : 0}
+        for instruction_number in range(start, end):
+            opcode = self.instructions[instruction_number][0]
+            if OPERATORS[opcode] in ('GOTO', 'GOTOF', 'GOTOT') or OPERATORS[opcode] in CONDITIONAL_JUMP_OPERATORS:
+                target = self.instructions[instruction_number][3]
+                if start <= target < end and target not in labels:
+                    labels[target] = None
+        for label, instruction_number in enumerate(sorted(labels)):
+            labels[instruction_number] = label
+
+        # The blocks are executed from the one of the label to the end of the
+        # function, unless one of them jumps
+        lines.append('    label = 0')
+        lines.append('    while True:')
+        calls = []
+        for instruction_number in range(start, end):
+            if instruction_number in labels:
+                lines.append('        if label <= ' + str(labels[instruction_number]) + ':')
+                lines.append('            pass')
+
+            operator = OPERATORS[self.instructions[instruction_number][0]]
+            if print_step_by_step == 'Y':
+                lines.append('            print(' + repr(str(self.quadruples[instruction_number])) + ')')
+            for line in self.generate_instruction(operator, self.instructions[instruction_number],
+                    labels, calls):
+                lines.append('            ' + line)
+        lines.append('        return')
+
+        return lines
+
+    def generate_source(self, print_step_by_step):
+        """Returns the Python code of the program"""
+        function_starts = sorted([(function['quadruple_number'] - 1, function)
+            for function in self.function_directory.function_list.values()
+            if function['quadruple_number'] > 0], key=lambda function_start: function_start[0])
+
+        lines = []
+        for position, (start, function) in enumerate(function_starts):
+            if position + 1 < len(function_starts):
+                end = function_starts[position + 1][0]
+            else:
+                end = self.number_of_instructions
+            lines.extend(self.generate_function(function, start, end, print_step_by_step))
+            lines.append('')
+
+        return '\n'.join(lines) + '\n'
+
+    def get_cache_path(self, print_step_by_step):
+        """Returns the file the code of the program is cached in, None when the
+        code is not cached"""
+        if self.source_code is None or self.cache_directory is None:
+            return None
+
+        # The code changes with the source, the quadruples generated from it,
+        # the values it writes as literals, the version of Python and the one
+        # of the generated code
+        quadruples = '\n'.join(str(quadruple) for quadruple in self.quadruples)
+        constants = repr(self.segment_values[CONSTANT_SEGMENT])
+        frames = repr([(function['name'], function['parameters']['addresses'],
+            function['frame_values'])
+            for function in self.function_directory.function_list.values()])
+        key = hashlib.sha256('\0'.join([BACKEND_VERSION, sys.version,
+            print_step_by_step, self.source_code, quadruples, constants,
+            frames]).encode()).hexdigest()
+        return os.path.join(self.cache_directory, key + '.mojoc')
+
+    def load_code(self, print_step_by_step):
+        """Returns the compiled code of the program, it comes from the cache
+        when the program was already compiled"""
+        cache_path = self.get_cache_path(print_step_by_step)
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as cache_file:
+                    return marshal.load(cache_file)
+            except (EOFError, ValueError, TypeError, OSError):
+                # A damaged or unreadable cache file is compiled again
+                pass
+
+        code = compile(self.generate_source(print_step_by_step), '<mojo>', 'exec')
+
+        if cache_path is not None:
+            temporal_path = (cache_path + '.' + str(os.getpid()) + '.'
+                + str(threading.get_ident()))
+            try:
+                os.makedirs(self.cache_directory, exist_ok=True)
+                with open(temporal_path, 'wb') as cache_file:
+                    marshal.dump(code, cache_file)
+                os.replace(temporal_path, cache_path)
+            except OSError:
+                # The code is not cached when the directory can't be written
+                if os.path.exists(temporal_path):
+                    os.remove(temporal_path)
+
+        return code
+
+    def make_memoized_function(self, python_function, function):
+        """Returns a Python function that calls a pure function unless the
+        result of a call with the same arguments is cached. Its parameters are
+        written out because Python 3.11 runs the calls with a star on the
+        stack of the interpreter, the other calls don't use it"""
+        parameters = ', '.join('v' + str(position)
+            for position in range(python_function.__code__.co_argcount))
+        source = ('def memoized_function(' + parameters + '):\n'
+            '    key = machine.get_call_key(function, [' + parameters + '])\n'
+            '    if machine.check_memo_cache(key):\n'
+            '        machine.set_operand_value(return_operand, machine.memo_cache[key])\n'
+            '    else:\n'
+            '        python_function(' + parameters + ')\n'
+            '        machine.add_to_memo_cache(key, machine.get_operand_value(return_operand))\n')
+        namespace = {
+            'machine' : self,
+            'function' : function,
+            'python_function' : python_function,
+            'return_operand' : self.get_return_operand(function)
+        }
+        exec(source, namespace)
+        return namespace['memoized_function']
+
+    def execute(self, print_step_by_step):
+        """Executes the program"""
+        namespace = {
+            'machine' : self,
+            'turtle' : turtle,
+            'segment_values' : self.segment_values,
+            'constant_values' : self.segment_values[CONSTANT_SEGMENT],
+            'get_address_value' : self.get_address_value,
+            'set_address_value' : self.set_address_value,
+            'divide' : self.divide,
+            'verify_index' : self.verify_index,
+            'read_input' : self.read_input
+        }
+        exec(self.load_code(print_step_by_step), namespace)
+
+        # The generated functions call each other through the namespace, the
+        # calls to the pure ones go through the cache
+        for function in self.function_directory.function_list.values():
+            if self.is_memoized(function):
+                function_name = 'function_' + function['name']
+                namespace[function_name] = self.make_memoized_function(
+                    namespace[function_name], function)
+
+        recursion_limit = sys.getrecursionlimit()
+        if sys.version_info >= (3, 11):
+            sys.setrecursionlimit(max(recursion_limit, CALL_DEPTH_LIMIT))
+        try:
+            namespace['function_main']()
+        except RecursionError:
+            print("ERROR: The calls are nested too deep for the python engine, "
+                + "execute the program with the vm engine")
+            sys.exit()
+        finally:
+            sys.setrecursionlimit(recursion_limit)
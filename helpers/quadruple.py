@@ -1,3 +1,5 @@
+from .opcodes import OPERAND_ROLES
+
 class Quadruple():
     """A class that represents a quadruple"""
 
@@ -14,6 +16,61 @@ class Quadruple():
         """Updates the quadruple's result with the number of the jump"""
         self.result = jump_number
 
+    def is_jump(self):
+        """Checks if the result of the quadruple is the quadruple it jumps to"""
+        return OPERAND_ROLES[self.operator][2] == 'jump'
+
+    def get_used_addresses(self):
+        """Returns the addresses the quadruple reads, the index address of a
+        dimensioned variable is read even when the variable is written"""
+        used_addresses = []
+        operands = [self.left_operand, self.right_operand, self.result]
+        for role, operand in zip(OPERAND_ROLES[self.operator], operands):
+            if isinstance(operand, dict):
+                used_addresses.append(operand['index_address'])
+            elif role == 'address':
+                used_addresses.append(operand)
+        return used_addresses
+
+    def get_stored_address(self):
+        """Returns the address the quadruple writes, None if it doesn't write
+        one or if it writes a dimensioned variable"""
+        if OPERAND_ROLES[self.operator][2] == 'store' and not isinstance(self.result, dict):
+            return self.result
+        else:
+            return None
+
+    def replace_used_address(self, address, new_address):
+        """Reads another address wherever the quadruple reads an address"""
+        left_role, right_role, result_role = OPERAND_ROLES[self.operator]
+        if left_role == 'address' and self.left_operand == address:
+            self.left_operand = new_address
+        if right_role == 'address' and self.right_operand == address:
+            self.right_operand = new_address
+        for operand in [self.left_operand, self.right_operand, self.result]:
+            if isinstance(operand, dict) and operand['index_address'] == address:
+                operand['index_address'] = new_address
+
+    def rename_addresses(self, new_addresses):
+        """Replaces every address the quadruple reads or writes that has a new
+        address"""
+        left_role, right_role, result_role = OPERAND_ROLES[self.operator]
+        operands = [self.left_operand, self.right_operand, self.result]
+        for position, (role, operand) in enumerate(zip([left_role, right_role, result_role], operands)):
+            if isinstance(operand, dict):
+                if operand['index_address'] in new_addresses:
+                    operand['index_address'] = new_addresses[operand['index_address']]
+            elif (role == 'address' or role == 'store') and operand in new_addresses:
+                operands[position] = new_addresses[operand]
+        self.left_operand, self.right_operand, self.result = operands
+
+    def copy(self):
+        """Returns a copy of the quadruple, the operands of dimensioned
+        variables are copied too so they can be renamed apart"""
+        operands = [dict(operand) if isinstance(operand, dict) else operand
+            for operand in [self.left_operand, self.right_operand, self.result]]
+        return Quadruple(self.quadruple_number, self.operator, *operands)
+
     def __str__(self):
         """The string representation of the class"""
         return (str(self.quadruple_number)  + " | " + str(self.operator) + ", "
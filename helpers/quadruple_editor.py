@@ -0,0 +1,154 @@
+import sys
+
+class QuadrupleEditor():
+    """Lets the list of quadruples of a program be edited, while it is open the
+    jumps and the start of the functions point to quadruples instead of numbers
+    so quadruples can be inserted and removed freely"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.quadruple_list = program.quadruple_list
+        self.function_directory = program.function_directory
+        self.removed_quadruples = set()
+
+        # A jump after the last quadruple ends the program, it points to the
+        # end mark
+        self.end_mark = object()
+
+        # Every jump points to the quadruple it jumps to
+        for quadruple in self.quadruple_list:
+            if quadruple.is_jump():
+                quadruple.result = self.get_quadruple(quadruple.result)
+
+        # Every function points to its first quadruple
+        self.function_starts = {}
+        for function_name, function in self.function_directory.function_list.items():
+            if function['quadruple_number'] > 0:
+                self.function_starts[function_name] = self.get_quadruple(function['quadruple_number'])
+
+    def get_quadruple(self, quadruple_number):
+        """Returns the quadruple with the number given, or the end mark"""
+        if quadruple_number == len(self.quadruple_list) + 1:
+            return self.end_mark
+        else:
+            return self.quadruple_list[quadruple_number - 1]
+
+    def get_jump_targets(self):
+        """Returns the ids of the quadruples some quadruple or function call
+        jumps to"""
+        jump_targets = set()
+        for quadruple in self.quadruple_list:
+            if quadruple.is_jump():
+                jump_targets.add(id(quadruple.result))
+        for quadruple in self.function_starts.values():
+            jump_targets.add(id(quadruple))
+        return jump_targets
+
+    def get_function_quadruples(self):
+        """Returns the name of every function with the positions of the first
+        quadruple that belongs to it and the one after its last quadruple"""
+        starts = {id(quadruple) : function_name for function_name, quadruple
+            in self.function_starts.items()}
+        function_ranges = []
+        for position, quadruple in enumerate(self.quadruple_list):
+            if id(quadruple) in starts:
+                if function_ranges:
+                    function_ranges[-1][2] = position
+                function_ranges.append([starts[id(quadruple)], position, len(self.quadruple_list)])
+        return [tuple(function_range) for function_range in function_ranges]
+
+    def insert_preheader(self, header, loop_quadruples, preheader):
+        """Inserts quadruples right before the header of a loop so they run
+        when the loop is entered, the jumps back from the quadruples of the
+        loop still go to the header. Returns False without inserting them when
+        the quadruple before the header continues into it from the loop"""
+        position = next(position for position, quadruple in enumerate(self.quadruple_list)
+            if quadruple is header)
+        previous_quadruple = self.quadruple_list[position - 1] if position > 0 else None
+        if (previous_quadruple is not None and id(previous_quadruple) in loop_quadruples
+                and previous_quadruple.operator not in ['GOTO', 'ENDPROC']):
+            return False
+
+        self.quadruple_list[position:position] = preheader
+
+        # The calls always enter the function through the preheader
+        for quadruple in self.quadruple_list:
+            if quadruple.is_jump() and quadruple.result is header and not (
+                    id(quadruple) in loop_quadruples and quadruple.operator != 'GOSUB'):
+                quadruple.result = preheader[0]
+        for function_name, quadruple in self.function_starts.items():
+            if quadruple is header:
+                self.function_starts[function_name] = preheader[0]
+        return True
+
+    def get_call_quadruples(self, quadruples, call_position):
+        """Returns the position of the ERA of the GOSUB at a position of some
+        quadruples and the positions of its parameters, the calls made to
+        compute its arguments are skipped. The position is -1 when the ERA is
+        not found"""
+        parameter_positions = []
+        nested_calls = 0
+        position = call_position - 1
+        while position >= 0:
+            operator = quadruples[position].operator
+            if operator == 'GOSUB':
+                nested_calls += 1
+            elif operator == 'ERA':
+                if nested_calls == 0:
+                    break
+                nested_calls -= 1
+            elif operator == 'PARAMETER' and nested_calls == 0:
+                parameter_positions.insert(0, position)
+            position -= 1
+        return position, parameter_positions
+
+    def remove(self, quadruple):
+        """Marks a quadruple to be removed, the jumps to it will go to the next
+        quadruple that remains"""
+        self.removed_quadruples.add(id(quadruple))
+
+    def is_removed(self, quadruple):
+        """Checks if a quadruple was marked to be removed"""
+        return id(quadruple) in self.removed_quadruples
+
+    def close(self):
+        """Removes the marked quadruples, numbers the remaining ones and points
+        the jumps and the functions back to quadruple numbers"""
+        # The quadruples removed are replaced by the next one that remains
+        replacements = {}
+        next_quadruple = self.end_mark
+        for quadruple in reversed(self.quadruple_list):
+            if self.is_removed(quadruple):
+                replacements[id(quadruple)] = next_quadruple
+            else:
+                next_quadruple = quadruple
+
+        self.quadruple_list[:] = [quadruple for quadruple in self.quadruple_list
+            if not self.is_removed(quadruple)]
+
+        quadruple_numbers = {id(self.end_mark) : len(self.quadruple_list) + 1}
+        for quadruple_number, quadruple in enumerate(self.quadruple_list, start=1):
+            quadruple.quadruple_number = quadruple_number
+            quadruple_numbers[id(quadruple)] = quadruple_number
+
+        for quadruple in self.quadruple_list:
+            if quadruple.is_jump():
+                quadruple.result = self.get_quadruple_number(quadruple.result,
+                    replacements, quadruple_numbers)
+
+        for function_name, quadruple in self.function_starts.items():
+            self.function_directory.function_list[function_name]['quadruple_number'] = (
+                self.get_quadruple_number(quadruple, replacements, quadruple_numbers))
+
+        self.program.quadruple_number = len(self.quadruple_list) + 1
+        self.removed_quadruples = set()
+
+    def get_quadruple_number(self, quadruple, replacements, quadruple_numbers):
+        """Returns the number a jump to a quadruple has after closing the editor"""
+        quadruple = replacements.get(id(quadruple), quadruple)
+        if id(quadruple) in quadruple_numbers:
+            return quadruple_numbers[id(quadruple)]
+        else:
+            print("A jump points to a quadruple that is not in the program: " + str(quadruple))
+            sys.exit()
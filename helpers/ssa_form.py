@@ -0,0 +1,166 @@
+from .control_flow_graph import ControlFlowGraph
+from .opcodes import OPERAND_ROLES
+from .quadruple_editor import QuadrupleEditor
+
+class SSAForm():
+    """Builds the static single assignment form of the functions of a program,
+    every write of a local or temporal variable creates a new version of it
+    and the blocks where several versions meet get a phi node that chooses
+    the one of the block the execution comes from. The versions are written
+    as tuples of the address of the variable and the version number, the
+    version 0 is the value the variable has when the function starts"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+
+    def optimize(self):
+        """Builds the form of every function and lowers it back to quadruples,
+        returns the number of phi nodes placed"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+
+        phi_nodes = 0
+        for function_name, start, end in editor.get_function_quadruples():
+            quadruples = quadruple_list[start:end]
+            function_form = self.build_function(function_name, quadruples)
+            phi_nodes += sum(len(phis) for phis in function_form['phis'])
+            self.lower_function(function_form)
+
+        editor.close()
+        return phi_nodes
+
+    def build_function(self, function_name, quadruples):
+        """Returns the form of the quadruples of a function, they are renamed
+        in place so the jumps between them remain"""
+        control_flow_graph = ControlFlowGraph(quadruples)
+        immediate_dominators = control_flow_graph.compute_immediate_dominators()
+        function_form = {
+            'name' : function_name,
+            'quadruples' : quadruples,
+            'control_flow_graph' : control_flow_graph,
+            'immediate_dominators' : immediate_dominators,
+            'dominator_tree' : control_flow_graph.get_dominator_tree(immediate_dominators),
+            'dominance_frontiers' : control_flow_graph.compute_dominance_frontiers(
+                immediate_dominators),
+            'phis' : [[] for block in control_flow_graph.blocks]
+        }
+        self.place_phis(function_form)
+        self.rename_variables(function_form)
+        return function_form
+
+    def place_phis(self, function_form):
+        """Places a phi node for a variable in the blocks where its writes stop
+        being dominated, only when the variable is read after them"""
+        control_flow_graph = function_form['control_flow_graph']
+        frontiers = function_form['dominance_frontiers']
+        live_in, live_out = control_flow_graph.compute_liveness()
+        reachable_blocks = control_flow_graph.get_reachable_blocks()
+
+        # Blocks that write each variable
+        definition_blocks = {}
+        for block_number in sorted(reachable_blocks):
+            for quadruple in control_flow_graph.blocks[block_number]:
+                stored_address = quadruple.get_stored_address()
+                if self.memory.is_frame_variable(stored_address):
+                    definition_blocks.setdefault(stored_address, set()).add(block_number)
+
+        for address in sorted(definition_blocks):
+            phi_blocks = set()
+            pending_blocks = list(definition_blocks[address])
+            while pending_blocks:
+                block_number = pending_blocks.pop()
+                for frontier_block in frontiers[block_number]:
+                    if frontier_block in phi_blocks or address not in live_in[frontier_block]:
+                        continue
+                    phi_blocks.add(frontier_block)
+                    function_form['phis'][frontier_block].append({
+                        'address' : address,
+                        'result' : None,
+                        'arguments' : {}
+                    })
+                    pending_blocks.append(frontier_block)
+
+    def rename_variables(self, function_form):
+        """Gives every write of a variable a new version and makes every read
+        use the version that reaches it, walking the dominator tree"""
+        control_flow_graph = function_form['control_flow_graph']
+        phis = function_form['phis']
+        versions = {}
+        current_versions = {}
+
+        pending_blocks = [(0, None)] if control_flow_graph.blocks else []
+        while pending_blocks:
+            block_number, restored_versions = pending_blocks.pop()
+            if restored_versions is not None:
+                # The versions of the block are no longer the current ones
+                # once its subtree is renamed
+                current_versions.update(restored_versions)
+                continue
+
+            restored_versions = {}
+            for phi in phis[block_number]:
+                phi['result'] = self.new_version(phi['address'], versions, current_versions,
+                    restored_versions)
+            for quadruple in control_flow_graph.blocks[block_number]:
+                self.rename_quadruple(quadruple, versions, current_versions, restored_versions)
+            for successor in control_flow_graph.successors[block_number]:
+                for phi in phis[successor]:
+                    phi['arguments'][block_number] = current_versions.get(phi['address'],
+                        (phi['address'], 0))
+
+            pending_blocks.append((block_number, restored_versions))
+            for child in reversed(function_form['dominator_tree'][block_number]):
+                pending_blocks.append((child, None))
+
+    def new_version(self, address, versions, current_versions, restored_versions):
+        """Returns a new version of a variable and makes it the current one"""
+        if address not in restored_versions:
+            restored_versions[address] = current_versions.get(address, (address, 0))
+        versions[address] = versions.get(address, 0) + 1
+        current_versions[address] = (address, versions[address])
+        return current_versions[address]
+
+    def rename_quadruple(self, quadruple, versions, current_versions, restored_versions):
+        """Replaces the variables a quadruple reads with their current version
+        and the one it writes with a new version"""
+        operands = [quadruple.left_operand, quadruple.right_operand, quadruple.result]
+        for position, (role, operand) in enumerate(zip(OPERAND_ROLES[quadruple.operator],
+                operands)):
+            if isinstance(operand, dict):
+                index_address = operand['index_address']
+                if self.memory.is_frame_variable(index_address):
+                    operands[position] = dict(operand)
+                    operands[position]['index_address'] = current_versions.get(index_address,
+                        (index_address, 0))
+            elif role == 'address' and self.memory.is_frame_variable(operand):
+                operands[position] = current_versions.get(operand, (operand, 0))
+
+        stored_address = quadruple.get_stored_address()
+        if self.memory.is_frame_variable(stored_address):
+            operands[2] = self.new_version(stored_address, versions, current_versions,
+                restored_versions)
+        quadruple.left_operand, quadruple.right_operand, quadruple.result = operands
+
+    def get_address(self, operand):
+        """Returns the address of a version, other operands are returned as
+        they are"""
+        if isinstance(operand, tuple):
+            return operand[0]
+        elif isinstance(operand, dict) and isinstance(operand['index_address'], tuple):
+            return dict(operand, index_address=operand['index_address'][0])
+        else:
+            return operand
+
+    def lower_function(self, function_form):
+        """Turns the form of a function back into quadruples. The versions of a
+        variable go back to its address, every version keeps the address of
+        its variable so the phi nodes choose between values already there and
+        are dropped without copies"""
+        control_flow_graph = function_form['control_flow_graph']
+        for quadruple in function_form['quadruples']:
+            quadruple.left_operand = self.get_address(quadruple.left_operand)
+            quadruple.right_operand = self.get_address(quadruple.right_operand)
+            quadruple.result = self.get_address(quadruple.result)
+        function_form['phis'] = [[] for block in control_flow_graph.blocks]
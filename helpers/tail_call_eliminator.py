@@ -0,0 +1,142 @@
+from .control_flow_graph import ControlFlowGraph
+from .memory_segment import DEFAULT_VALUES
+from .quadruple import Quadruple
+from .quadruple_editor import QuadrupleEditor
+
+class TailCallEliminator():
+    """Turns the calls a function makes to itself right before it ends into
+    assignments of its parameters and a jump to its first quadruple, so the
+    recursion runs without creating new frames"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.function_directory = program.function_directory
+
+    def optimize(self):
+        """Eliminates the tail calls of every function, returns the number of
+        calls eliminated"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        jump_targets = editor.get_jump_targets()
+
+        # The quadruples of every function are taken before any is inserted
+        functions = [(function_name, quadruple_list[start:end]) for function_name, start, end
+            in editor.get_function_quadruples()]
+
+        eliminated_calls = 0
+        for function_name, quadruples in functions:
+            eliminated_calls += self.eliminate_function_tail_calls(function_name, quadruples,
+                editor, jump_targets)
+
+        editor.close()
+        return eliminated_calls
+
+    def is_tail_call(self, quadruples, position):
+        """Checks if a function ends right after the call of a position returns,
+        following the GOTOs after it"""
+        if position + 1 >= len(quadruples):
+            return False
+        next_quadruple = quadruples[position + 1]
+        visited_quadruples = set()
+        while next_quadruple.operator == 'GOTO' and id(next_quadruple) not in visited_quadruples:
+            visited_quadruples.add(id(next_quadruple))
+            next_quadruple = next_quadruple.result
+            if not isinstance(next_quadruple, Quadruple):
+                return False
+        return next_quadruple.operator == 'ENDPROC'
+
+    def get_parameter_assignments(self, function_name, quadruples, parameter_positions,
+            call_position):
+        """Returns every parameter quadruple of a call with the temporal its
+        argument waits in and the parameter it is assigned to, None when the
+        function has no temporals left. An argument is written straight into
+        its parameter unless a later argument reads the parameter, the
+        constants and temporals are assigned right before jumping"""
+        function = self.function_directory.function_list[function_name]
+        assignments = []
+        for parameter_position, parameter_address in zip(parameter_positions,
+                function['parameters']['addresses']):
+            argument = quadruples[parameter_position].left_operand
+            temporal = None
+            if (self.memory.constant_memory.contains(argument)
+                    or self.memory.temporal_memory.contains(argument)):
+                # Writing the parameters doesn't change the argument
+                temporal = argument
+            elif any(parameter_address in quadruple.get_used_addresses()
+                    for quadruple in quadruples[parameter_position + 1:call_position]):
+                parameter_type = self.memory.local_memory.determines_segment_tpye(parameter_address)
+                temporal = self.program.request_function_temporal(function_name, parameter_type)
+                if temporal is None:
+                    return None
+            assignments.append((quadruples[parameter_position], temporal, parameter_address))
+        return assignments
+
+    def eliminate_function_tail_calls(self, function_name, quadruples, editor, jump_targets):
+        """Replaces the tail calls of a function to itself, returns the number
+        of calls replaced"""
+        function = self.function_directory.function_list[function_name]
+        parameter_addresses = function['parameters']['addresses']
+        quadruple_list = self.program.quadruple_list
+
+        tail_calls = [(call_position, call) for call_position, call in enumerate(quadruples)
+            if call.operator == 'GOSUB' and call.left_operand == function_name
+            and self.is_tail_call(quadruples, call_position)]
+        if not tail_calls:
+            return 0
+
+        # A new frame starts with the default values, the variables read before
+        # they are written get them again before jumping
+        control_flow_graph = ControlFlowGraph(quadruples)
+        live_in, live_out = control_flow_graph.compute_liveness()
+        initializations = []
+        for address in sorted(live_in[0]):
+            if self.memory.is_frame_variable(address) and address not in parameter_addresses:
+                address_type = self.memory.locate_memory_segment(address).determines_segment_tpye(address)
+                default_address = self.memory.get_constant_address(address_type, DEFAULT_VALUES[address_type])
+                if default_address is None:
+                    return 0
+                initializations.append((default_address, address))
+
+        eliminated_calls = 0
+        for call_position, call in tail_calls:
+            era_position, parameter_positions = editor.get_call_quadruples(quadruples, call_position)
+            if era_position < 0 or len(parameter_positions) != len(parameter_addresses):
+                continue
+
+            assignments = self.get_parameter_assignments(function_name, quadruples,
+                parameter_positions, call_position)
+            if assignments is None:
+                continue
+
+            editor.remove(quadruples[era_position])
+            waiting_arguments = []
+            for parameter, temporal, parameter_address in assignments:
+                parameter.operator = '='
+                if temporal is not None:
+                    waiting_arguments.append(Quadruple(0, '=', temporal, None, parameter_address))
+                if temporal == parameter.left_operand or parameter.left_operand == parameter_address:
+                    editor.remove(parameter)
+                elif temporal is not None:
+                    parameter.result = temporal
+                else:
+                    parameter.result = parameter_address
+
+            jump_quadruples = waiting_arguments + [Quadruple(0, '=', default_address, None, address)
+                for default_address, address in initializations]
+            position = next(position for position, quadruple in enumerate(quadruple_list)
+                if quadruple is call)
+            quadruple_list[position:position] = jump_quadruples
+
+            call.operator = 'GOTO'
+            call.left_operand = None
+
+            # The GOTO to the end of the function after the call is never
+            # executed now
+            next_quadruple = quadruples[call_position + 1]
+            if next_quadruple.operator == 'GOTO' and id(next_quadruple) not in jump_targets:
+                editor.remove(next_quadruple)
+            eliminated_calls += 1
+
+        return eliminated_calls
@@ -0,0 +1,101 @@
+from .control_flow_graph import ControlFlowGraph
+from .quadruple_editor import QuadrupleEditor
+
+class TemporalAllocator():
+    """Assigns the temporal addresses of every function again, temporals that
+    are never live at the same time share the same address"""
+
+    def __init__(self, program):
+        """Class constructor"""
+        self.program = program
+        self.memory = program.memory
+        self.temporal_segment = program.memory.temporal_memory
+
+    def get_type_base_address(self, address):
+        """Returns the first address of the type segment of a temporal address"""
+        type_segment_size = self.temporal_segment.type_segment_size
+        return address - (address - self.temporal_segment.initial_address) % type_segment_size
+
+    def optimize(self):
+        """Reassigns the temporals of every function, returns the number of
+        temporal addresses saved"""
+        editor = QuadrupleEditor(self.program)
+        quadruple_list = self.program.quadruple_list
+        function_list = self.program.function_directory.function_list
+
+        saved_temporals = 0
+        for function_name, start, end in editor.get_function_quadruples():
+            saved_temporals += self.allocate_function_temporals(function_list[function_name],
+                quadruple_list[start:end])
+
+        editor.close()
+        return saved_temporals
+
+    def get_interferences(self, quadruples):
+        """Returns the temporals of the quadruples with the temporals that are
+        live when each one is written, in the order they first appear"""
+        control_flow_graph = ControlFlowGraph(quadruples)
+        live_in, live_out = control_flow_graph.compute_liveness()
+
+        temporals = []
+        for quadruple in quadruples:
+            for address in quadruple.get_used_addresses() + [quadruple.get_stored_address()]:
+                if self.temporal_segment.contains(address) and address not in temporals:
+                    temporals.append(address)
+        interferences = {temporal : set() for temporal in temporals}
+
+        # A temporal written while another one is live can't share its address
+        for block_number in range(len(control_flow_graph.blocks)):
+            live_after = control_flow_graph.get_live_after_quadruples(block_number, live_out)
+            for quadruple, live in zip(control_flow_graph.blocks[block_number], live_after):
+                stored_address = quadruple.get_stored_address()
+                if self.temporal_segment.contains(stored_address):
+                    for address in live:
+                        if self.temporal_segment.contains(address) and address != stored_address:
+                            interferences[stored_address].add(address)
+                            interferences[address].add(stored_address)
+
+        # A temporal read before it is written keeps the value it starts with,
+        # it can't share its address with any other temporal
+        if control_flow_graph.blocks:
+            for address in live_in[0]:
+                if self.temporal_segment.contains(address):
+                    for temporal in temporals:
+                        if temporal != address:
+                            interferences[address].add(temporal)
+                            interferences[temporal].add(address)
+
+        return temporals, interferences
+
+    def allocate_function_temporals(self, function, quadruples):
+        """Reassigns the temporals of a function and updates the number of
+        temporals it has, returns the number of temporal addresses saved"""
+        temporals, interferences = self.get_interferences(quadruples)
+
+        # Every temporal takes the first address of its type segment that no
+        # interfering temporal took
+        new_addresses = {}
+        for temporal in temporals:
+            base_address = self.get_type_base_address(temporal)
+            taken_addresses = set(new_addresses[address] for address in interferences[temporal]
+                if address in new_addresses)
+            new_address = base_address
+            while new_address in taken_addresses:
+                new_address += 1
+            new_addresses[temporal] = new_address
+
+        for quadruple in quadruples:
+            quadruple.rename_addresses(new_addresses)
+
+        # The frame of the function only keeps the temporals still used
+        number_of_temporals = function['number_of_temporal_variables']
+        previous_temporals = sum(number_of_temporals.values())
+        for temporal_type in number_of_temporals:
+            number_of_temporals[temporal_type] = 0
+        for new_address in new_addresses.values():
+            temporal_type = self.temporal_segment.determines_segment_tpye(new_address)
+            base_address = self.get_type_base_address(new_address)
+            number_of_temporals[temporal_type] = max(number_of_temporals[temporal_type],
+                new_address - base_address + 1)
+
+        return previous_temporals - sum(number_of_temporals.values())
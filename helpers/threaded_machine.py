@@ -0,0 +1,426 @@
+from .linker import INDIRECT, FRAME
+from .memory import CONSTANT_SEGMENT
+from .opcodes import OPCODES, OPERATORS, OPERAND_ROLES
+from .virtual_machine import VirtualMachine
+
+import operator
+import sys
+
+# Operations of two operands that store their result, by opcode
+BINARY_OPERATIONS = {
+    OPCODES['+'] : operator.add,
+    OPCODES['-'] : operator.sub,
+    OPCODES['*'] : operator.mul,
+    OPCODES['>'] : operator.gt,
+    OPCODES['<'] : operator.lt,
+    OPCODES['>='] : operator.ge,
+    OPCODES['<='] : operator.le,
+    OPCODES['=='] : operator.eq,
+    OPCODES['!='] : operator.ne,
+    OPCODES['and'] : lambda left_operand, right_operand: left_operand and right_operand,
+    OPCODES['or'] : lambda left_operand, right_operand: left_operand or right_operand
+}
+
+# Conditional jumps that compare two operands, by opcode
+CONDITIONAL_JUMPS = {
+    OPCODES['GOTOF_GT'] : operator.gt,
+    OPCODES['GOTOF_LT'] : operator.lt,
+    OPCODES['GOTOF_GE'] : operator.ge,
+    OPCODES['GOTOF_LE'] : operator.le,
+    OPCODES['GOTOF_EQ'] : operator.eq,
+    OPCODES['GOTOF_NE'] : operator.ne
+}
+
+class ThreadedMachine(VirtualMachine):
+    """Executes the instructions as a chain of closures, every closure does the
+    work of one instruction and returns the closure to execute next"""
+
+    def __init__(self, memory, function_directory, instructions, memoize=True):
+        """Class constructor"""
+        super().__init__(memory, function_directory, instructions, memoize)
+
+        # Maps each opcode to the method that builds its closure, the opcodes
+        # without one are executed by the method of the virtual machine
+        self.compilers = {
+            OPCODES['/'] : self.compile_division,
+            OPCODES['='] : self.compile_assignment,
+            OPCODES['RETURN'] : self.compile_assignment,
+            OPCODES['GOTO'] : self.compile_goto,
+            OPCODES['GOTOF'] : self.compile_gotof,
+            OPCODES['GOTOT'] : self.compile_gotot,
+            OPCODES['VERF_INDEX'] : self.compile_verify_index,
+            OPCODES['ERA'] : self.compile_era,
+            OPCODES['PARAMETER'] : self.compile_parameter,
+            OPCODES['GOSUB'] : self.compile_gosub,
+            OPCODES['ENDPROC'] : self.compile_endproc
+        }
+
+    def compile_getter(self, operand):
+        """Returns a function that reads the value of a linked operand"""
+        segment, slot = operand
+        machine = self
+        call_stack = self.call_stack
+
+        if segment == FRAME:
+            def get_frame_value():
+                return call_stack[machine.frame_pointer + slot]
+            return get_frame_value
+        elif segment == INDIRECT:
+            def get_indirect_value():
+                return machine.get_operand_value(machine.resolve_indirect_operand(slot))
+            return get_indirect_value
+        elif segment == CONSTANT_SEGMENT:
+            # Constants never change while the program executes
+            value = self.segment_values[segment][slot]
+            def get_constant_value():
+                return value
+            return get_constant_value
+        else:
+            values = self.segment_values[segment]
+            def get_segment_value():
+                return values[slot]
+            return get_segment_value
+
+    def compile_setter(self, operand):
+        """Returns a function that edits the value of a linked operand"""
+        segment, slot = operand
+        machine = self
+        call_stack = self.call_stack
+
+        if segment == FRAME:
+            def set_frame_value(value):
+                call_stack[machine.frame_pointer + slot] = value
+            return set_frame_value
+        elif segment == INDIRECT:
+            def set_indirect_value(value):
+                machine.set_operand_value(machine.resolve_indirect_operand(slot), value)
+            return set_indirect_value
+        else:
+            values = self.segment_values[segment]
+            def set_segment_value(value):
+                values[slot] = value
+            return set_segment_value
+
+    def compile_instruction(self, instruction):
+        """Returns the closure of an instruction and a function that links it
+        with the closure that follows it and the closure it jumps to"""
+        opcode, left_operand_address, right_operand_address, result_address = instruction
+
+        if opcode in BINARY_OPERATIONS:
+            return self.compile_binary_operation(BINARY_OPERATIONS[opcode],
+                left_operand_address, right_operand_address, result_address)
+        elif opcode in CONDITIONAL_JUMPS:
+            return self.compile_conditional_jump(CONDITIONAL_JUMPS[opcode],
+                left_operand_address, right_operand_address, result_address)
+        elif opcode in self.compilers:
+            return self.compilers[opcode](left_operand_address, right_operand_address,
+                result_address)
+        else:
+            return self.compile_handler(self.dispatch_table[opcode],
+                left_operand_address, right_operand_address, result_address)
+
+    def compile(self, print_step_by_step):
+        """Returns the closure of the first instruction, after building and
+        linking the closures of every instruction"""
+        closures = []
+        links = []
+        for instruction, quadruple in zip(self.instructions, self.quadruples):
+            closure, link = self.compile_instruction(instruction)
+
+            if print_step_by_step == 'Y':
+                closure = self.compile_step(closure, quadruple)
+
+            closures.append(closure)
+            links.append(link)
+
+        # The closure after the last one is None, it ends the execution
+        closures.append(None)
+        for instruction_number, link in enumerate(links):
+            opcode, left_operand_address, right_operand_address, result_address = (
+                self.instructions[instruction_number])
+            if OPERAND_ROLES[OPERATORS[opcode]][2] == 'jump':
+                jump_closure = closures[result_address]
+            else:
+                jump_closure = None
+            link(closures[instruction_number + 1], jump_closure)
+
+        return closures[0]
+
+    def execute(self, print_step_by_step):
+        """Executes the instructions"""
+        current_closure = self.compile(print_step_by_step)
+
+        while current_closure is not None:
+            current_closure = current_closure()
+
+    def compile_step(self, closure, quadruple):
+        """Wraps a closure so it prints its quadruple before executing"""
+        def step():
+            print(quadruple)
+            return closure()
+        return step
+
+    def compile_handler(self, handler, left_operand_address, right_operand_address,
+            result_address):
+        """Builds the closure of an instruction the virtual machine executes"""
+        next_closure = None
+
+        def execute_handler():
+            handler(left_operand_address, right_operand_address, result_address)
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure
+            next_closure = following_closure
+
+        return execute_handler, link
+
+    def compile_binary_operation(self, operation, left_operand_address,
+            right_operand_address, result_address):
+        """Builds the closure of an operation of two operands"""
+        get_left_operand = self.compile_getter(left_operand_address)
+        get_right_operand = self.compile_getter(right_operand_address)
+        set_result = self.compile_setter(result_address)
+        next_closure = None
+
+        def binary_operation():
+            set_result(operation(get_left_operand(), get_right_operand()))
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure
+            next_closure = following_closure
+
+        return binary_operation, link
+
+    def compile_division(self, left_operand_address, right_operand_address,
+            result_address):
+        """Builds the closure of a division"""
+        get_left_operand = self.compile_getter(left_operand_address)
+        get_right_operand = self.compile_getter(right_operand_address)
+        set_result = self.compile_setter(result_address)
+        next_closure = None
+
+        def division():
+            left_operand = get_left_operand()
+            right_operand = get_right_operand()
+
+            if right_operand == 0:
+                print("ERROR: Divisions by 0 are not allowed")
+                sys.exit()
+
+            # Exact division if a float is involved
+            if isinstance(left_operand, float) or isinstance(right_operand, float):
+                set_result(left_operand / right_operand)
+            else:
+                set_result(int(left_operand / right_operand))
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure
+            next_closure = following_closure
+
+        return division, link
+
+    def compile_assignment(self, left_operand_address, right_operand_address,
+            result_address):
+        """Builds the closure of an assignment or a return"""
+        get_left_operand = self.compile_getter(left_operand_address)
+        set_result = self.compile_setter(result_address)
+        next_closure = None
+
+        def assignment():
+            set_result(get_left_operand())
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure
+            next_closure = following_closure
+
+        return assignment, link
+
+    def compile_goto(self, left_operand_address, right_operand_address, result_address):
+        """Builds the closure of an unconditional jump"""
+        target_closure = None
+
+        def goto():
+            return target_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal target_closure
+            target_closure = jump_closure
+
+        return goto, link
+
+    def compile_gotof(self, left_operand_address, right_operand_address, result_address):
+        """Builds the closure of a jump taken when the operand is false"""
+        get_left_operand = self.compile_getter(left_operand_address)
+        next_closure = None
+        target_closure = None
+
+        def gotof():
+            if get_left_operand():
+                return next_closure
+            return target_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure, target_closure
+            next_closure = following_closure
+            target_closure = jump_closure
+
+        return gotof, link
+
+    def compile_gotot(self, left_operand_address, right_operand_address, result_address):
+        """Builds the closure of a jump taken when the operand is true"""
+        get_left_operand = self.compile_getter(left_operand_address)
+        next_closure = None
+        target_closure = None
+
+        def gotot():
+            if get_left_operand():
+                return target_closure
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure, target_closure
+            next_closure = following_closure
+            target_closure = jump_closure
+
+        return gotot, link
+
+    def compile_conditional_jump(self, comparison, left_operand_address,
+            right_operand_address, result_address):
+        """Builds the closure of a jump taken when a comparison is false"""
+        get_left_operand = self.compile_getter(left_operand_address)
+        get_right_operand = self.compile_getter(right_operand_address)
+        next_closure = None
+        target_closure = None
+
+        def conditional_jump():
+            if comparison(get_left_operand(), get_right_operand()):
+                return next_closure
+            return target_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure, target_closure
+            next_closure = following_closure
+            target_closure = jump_closure
+
+        return conditional_jump, link
+
+    def compile_verify_index(self, left_operand_address, right_operand_address,
+            result_address):
+        """Builds the closure that verifies the index of a dimensioned variable"""
+        get_index = self.compile_getter(left_operand_address)
+        lower_limit = right_operand_address
+        upper_limit = result_address
+        next_closure = None
+
+        def verify_index():
+            if not (lower_limit <= get_index() < upper_limit):
+                print("Index out of bound")
+                sys.exit()
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure
+            next_closure = following_closure
+
+        return verify_index, link
+
+    def compile_era(self, left_operand_address, right_operand_address, result_address):
+        """Builds the closure that creates the frame of a function"""
+        frame_values = left_operand_address['frame_values']
+        call_stack = self.call_stack
+        called_frame_list = self.called_frame_list
+        next_closure = None
+
+        def era():
+            called_frame_list.append(len(call_stack))
+            call_stack.extend(frame_values)
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure
+            next_closure = following_closure
+
+        return era, link
+
+    def compile_parameter(self, left_operand_address, right_operand_address,
+            result_address):
+        """Builds the closure that passes an argument to a function"""
+        get_left_operand = self.compile_getter(left_operand_address)
+        call_stack = self.call_stack
+        called_frame_list = self.called_frame_list
+        next_closure = None
+
+        def parameter():
+            call_stack[called_frame_list[-1] + result_address] = get_left_operand()
+            return next_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure
+            next_closure = following_closure
+
+        return parameter, link
+
+    def compile_gosub(self, left_operand_address, right_operand_address, result_address):
+        """Builds the closure that starts the execution of a function"""
+        machine = self
+        function = left_operand_address
+        return_list = self.return_list
+        called_frame_list = self.called_frame_list
+        next_closure = None
+        target_closure = None
+
+        def gosub():
+            # The function returns to the closure after this one
+            return_list.append((next_closure, machine.frame_pointer, machine.current_function, None))
+            machine.frame_pointer = called_frame_list.pop()
+            machine.current_function = function
+            return target_closure
+
+        def memoized_gosub():
+            key = machine.get_call_key(function, machine.get_frame_arguments(function,
+                called_frame_list[-1]))
+            if machine.check_memo_cache(key):
+                # The cached result is returned without executing the function
+                del call_stack[called_frame_list.pop():]
+                set_return_value(machine.memo_cache[key])
+                return next_closure
+            return_list.append((next_closure, machine.frame_pointer, machine.current_function, key))
+            machine.frame_pointer = called_frame_list.pop()
+            machine.current_function = function
+            return target_closure
+
+        def link(following_closure, jump_closure):
+            nonlocal next_closure, target_closure
+            next_closure = following_closure
+            target_closure = jump_closure
+
+        if self.is_memoized(function):
+            call_stack = self.call_stack
+            set_return_value = self.compile_setter(self.get_return_operand(function))
+            return memoized_gosub, link
+        else:
+            return gosub, link
+
+    def compile_endproc(self, left_operand_address, right_operand_address, result_address):
+        """Builds the closure that ends the execution of a function"""
+        machine = self
+        call_stack = self.call_stack
+        return_list = self.return_list
+
+        def endproc():
+            del call_stack[machine.frame_pointer:]
+            returned_function = machine.current_function
+            return_closure, machine.frame_pointer, machine.current_function, key = return_list.pop()
+            if key is not None:
+                machine.add_to_memo_cache(key, machine.get_operand_value(
+                    machine.get_return_operand(returned_function)))
+            return return_closure
+
+        def link(following_closure, jump_closure):
+            pass
+
+        return endproc, link
@@ -2,15 +2,24 @@ import json # Used to give format at printing dictionaries
 import sys # Prints segment in a dictionary format, booleans are min caps
 
 class TypeSegment():
-    """Represents a segment of the memory for a primitive type"""
+    """Represents a segment of the memory for a primitive type, its values are
+    stored in the list of the memory segment it belongs to"""
 
-    def __init__(self, segment_name, initial_address, final_address):
+    def __init__(self, segment_name, initial_address, final_address, values,
+            first_slot):
         """Class constructor"""
         self.name = segment_name
         self.initial_address = initial_address
         self.final_address = final_address
         self.current_address = initial_address
-        self.segment = {}
+        self.values = values
+
+        # Position of the initial address in the list of values
+        self.first_slot = first_slot
+
+        # First address requested for every value, indexed by its type and
+        # value so equal values of other types don't share it
+        self.value_addresses = {}
 
     def __str__(self):
         """The string representation of the class"""
@@ -18,7 +27,18 @@ class TypeSegment():
                 "   Initial address: " + str(self.initial_address) + "\n" +
                 "   Final address: " + str(self.final_address) + "\n" +
                 "   Current address " + str(self.current_address) + "\n" +
-                "   Addresses " + json.dumps(self.segment, indent=4))
+                "   Addresses " + json.dumps(self.get_segment(), indent=4))
+
+    def get_segment(self):
+        """Returns the addresses used and its values as a dictionary"""
+        segment = {}
+        for address in range(self.initial_address, self.current_address):
+            segment[address] = self.values[self.get_slot(address)]
+        return segment
+
+    def get_slot(self, address):
+        """Returns the position of an address in the list of values"""
+        return address - self.initial_address + self.first_slot
 
     def available_space(self, total_addresses=0):
         """Determines if the segment is not full"""
@@ -29,7 +49,7 @@ class TypeSegment():
 
     def valid_address(self, address):
         """Determines if an address is a valid one"""
-        if address in self.segment:
+        if address >= self.initial_address and address < self.current_address:
             return True
         else:
             return False
@@ -38,7 +58,8 @@ class TypeSegment():
         """Allocates an address for a variable or constant"""
         if self.available_space():
             address = self.current_address
-            self.segment[address] = value
+            self.values[self.get_slot(address)] = value
+            self.value_addresses.setdefault((type(value), value), address)
             self.current_address += 1
             return address
         else:
@@ -49,11 +70,12 @@ class TypeSegment():
         """Allocates a bunch of addresses"""
         if self.available_space(total_addresses):
             base_address = self.current_address
+            first_slot = self.get_slot(base_address)
 
-            # Request a unique address for each element
-            for i in range(total_addresses):
-                self.segment[self.current_address] = value
-                self.current_address += 1
+            # Sets the value of every element at once
+            self.values[first_slot:first_slot + total_addresses] = [value] * total_addresses
+            self.value_addresses.setdefault((type(value), value), base_address)
+            self.current_address += total_addresses
 
             return base_address
         else:
@@ -63,24 +85,31 @@ class TypeSegment():
     def get_value(self, address):
         """Returns a value related to an address"""
         if self.valid_address(address):
-            return self.segment[address]
+            return self.values[self.get_slot(address)]
         else:
             print("The address you requested a value is not valid")
             return None
 
     def check_existing_value(self, existing_value):
-        """Checks if the value exists in the segment"""
-        for address, value in self.segment.items():
-            # Constant values are unique, there's only one address per value
-            if value == existing_value:
+        """Checks if the value exists in the segment, only the values written
+        through the segment are found, the constants are never written
+        another way"""
+        address = self.value_addresses.get((type(existing_value), existing_value))
+
+        # The address may hold another value since it was requested
+        if address is not None and self.valid_address(address):
+            value = self.values[self.get_slot(address)]
+            if type(value) == type(existing_value) and value == existing_value:
                 return address
+
         # Returns nothing if the value doesn't exists
         return None
 
     def edit_value(self, address, value):
         """Edits the value related to an address"""
         if self.valid_address(address):
-            self.segment[address] = value
+            self.values[self.get_slot(address)] = value
+            self.value_addresses.setdefault((type(value), value), address)
         else:
             print("The address: " + str(address) + " you are trying to change" +
                 " its value is not valid")
@@ -88,5 +117,8 @@ class TypeSegment():
 
     def reset(self):
         """Clears all the addresses, starts at its initial adress"""
-        self.segment.clear()
+        first_slot = self.get_slot(self.initial_address)
+        last_slot = self.get_slot(self.current_address)
+        self.values[first_slot:last_slot] = [None] * (last_slot - first_slot)
+        self.value_addresses = {}
         self.current_address = self.initial_address
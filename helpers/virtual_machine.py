@@ -1,40 +1,123 @@
 from .function_directory import FunctionDirectory
-from .memory import Memory
+from .linker import Linker, INDIRECT, FRAME
+from .memory import LOCAL_SEGMENT, TEMPORAL_SEGMENT
+from .opcodes import OPERATORS, OPCODES
 
 from ast import literal_eval
+from collections import OrderedDict
 import turtle
 import sys
 
+# Results of the calls to pure functions the machine remembers
+MEMO_CACHE_SIZE = 1024
+
 class VirtualMachine():
     """Simulates the execution a processor performs over a list of instructions"""
-    def __init__(self, memory, function_directory, instructions):
+    def __init__(self, memory, function_directory, instructions, memoize=True):
         self.memory = memory
         self.function_directory = function_directory
-        self.instructions = instructions
-        self.number_of_instructions = len(self.instructions)
+        self.quadruples = instructions
+        self.number_of_instructions = len(self.quadruples)
         self.number_of_current_instruction = 0
 
-    def request_local_addresses(self, function_called):
-        """Request the number of local addresses a function has for each type"""
-        for i in range(function_called['function']['number_of_local_variables']['int']):
-            function_called['memory'].request_local_address('int')
-        for i in range(function_called['function']['number_of_local_variables']['float']):
-            function_called['memory'].request_local_address('float')
-        for i in range(function_called['function']['number_of_local_variables']['string']):
-            function_called['memory'].request_local_address('string')
-        for i in range(function_called['function']['number_of_local_variables']['bool']):
-            function_called['memory'].request_local_address('bool')
-
-    def request_temporal_addresses(self, function_called):
-        """Request the number of temporal addresses a function has for each type"""
-        for i in range(function_called['function']['number_of_temporal_variables']['int']):
-            function_called['memory'].request_temporal_address('int')
-        for i in range(function_called['function']['number_of_temporal_variables']['float']):
-            function_called['memory'].request_temporal_address('float')
-        for i in range(function_called['function']['number_of_temporal_variables']['string']):
-            function_called['memory'].request_temporal_address('string')
-        for i in range(function_called['function']['number_of_temporal_variables']['bool']):
-            function_called['memory'].request_temporal_address('bool')
+        # Links the quadruples before executing them, the operator of each
+        # instruction becomes its integer opcode and its operands are resolved
+        # to segment positions, so the execution never decodes them
+        self.linker = Linker(memory, function_directory)
+        self.instructions = self.linker.link(self.quadruples)
+
+        # The values of the global and constant segments in the positions the
+        # linker resolved them
+        self.segment_values = [memory_segment.values
+            for memory_segment in self.memory.memory_segments]
+
+        # The local and temporal variables of the functions being executed are
+        # placed in frames of a single call stack, the frame pointer is where
+        # the frame of the current function starts. Main's frame is the first
+        self.current_function = self.function_directory.get_function('main')
+        self.call_stack = list(self.current_function['frame_values'])
+        self.frame_pointer = 0
+        self.called_frame_list = [] # Frames created by ERA waiting for its GOSUB
+        # The instruction number, frame pointer and function we are returning
+        # to after executing a function, and the key its result is cached with
+        self.return_list = []
+        self.current_turtle = None
+
+        # The results of the pure functions are cached by their arguments, the
+        # least recently used result is dropped when the cache is full
+        self.memoize = memoize
+        self.memo_cache = OrderedDict()
+        self.memo_cache_size = MEMO_CACHE_SIZE
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+        # Frame slots of the parameters and linked return address of every
+        # pure function
+        self.memoized_functions = {}
+        for function in self.function_directory.function_list.values():
+            if function.get('pure'):
+                parameter_slots = [self.linker.resolve_frame_slot(function, address)
+                    for address in function['parameters']['addresses']]
+                self.memoized_functions[function['name']] = (parameter_slots,
+                    self.linker.resolve_address(function['return_address'], function))
+
+        # Maps each opcode to the method that executes it
+        handlers = {
+            '+' : self.execute_addition,
+            '-' : self.execute_subtraction,
+            '*' : self.execute_multiplication,
+            '/' : self.execute_division,
+            '=' : self.execute_assignment,
+            '>' : self.execute_greater_than,
+            '<' : self.execute_less_than,
+            '>=' : self.execute_greater_equal,
+            '<=' : self.execute_less_equal,
+            '==' : self.execute_equal,
+            '!=' : self.execute_not_equal,
+            'and' : self.execute_and,
+            'or' : self.execute_or,
+            'PRINT' : self.execute_print,
+            'READ' : self.execute_read,
+            'GOTO' : self.execute_goto,
+            'GOTOF' : self.execute_gotof,
+            'GOTOT' : self.execute_gotot,
+            'VERF_INDEX' : self.execute_verify_index,
+            'RETURN' : self.execute_return,
+            'ERA' : self.execute_era,
+            'PARAMETER' : self.execute_parameter,
+            'GOSUB' : self.execute_gosub,
+            'ENDPROC' : self.execute_endproc,
+            'GOTOF_GT' : self.execute_gotof_greater_than,
+            'GOTOF_LT' : self.execute_gotof_less_than,
+            'GOTOF_GE' : self.execute_gotof_greater_equal,
+            'GOTOF_LE' : self.execute_gotof_less_equal,
+            'GOTOF_EQ' : self.execute_gotof_equal,
+            'GOTOF_NE' : self.execute_gotof_not_equal,
+            'CREATE_TURTLE' : self.execute_create_turtle,
+            'RESET' : self.execute_reset,
+            'FINISH_DRAWING' : self.execute_finish_drawing,
+            'PEN_UP' : self.execute_pen_up,
+            'PEN_DOWN' : self.execute_pen_down,
+            'BEGIN_FILL' : self.execute_begin_fill,
+            'END_FILL' : self.execute_end_fill,
+            'PEN_COLOR' : self.execute_pen_color,
+            'FILL_COLOR' : self.execute_fill_color,
+            'PEN_WIDTH' : self.execute_pen_width,
+            'MOVE_FORWARD' : self.execute_move_forward,
+            'MOVE_RIGHT' : self.execute_move_right,
+            'MOVE_LEFT' : self.execute_move_left,
+            'TURN_RIGHT' : self.execute_turn_right,
+            'TURN_LEFT' : self.execute_turn_left,
+            'DRAW_SQUARE' : self.execute_draw_square,
+            'DRAW_TRIANGLE' : self.execute_draw_triangle,
+            'DRAW_CIRCLE' : self.execute_draw_circle,
+            'DRAW_RECTANGLE' : self.execute_draw_rectangle,
+            'SET_POSITION' : self.execute_set_position,
+            'SET_SPEED' : self.execute_set_speed
+        }
+        self.dispatch_table = [None] * len(OPERATORS)
+        for operator, handler in handlers.items():
+            self.dispatch_table[OPCODES[operator]] = handler
 
     def get_input_type(self, value):
         """"""
@@ -66,418 +149,450 @@ class VirtualMachine():
         elif self.get_input_type(value) is str:
             return value
 
+
+    def resolve_indirect_operand(self, operand):
+        """Returns the operand an indirect operand points to"""
+        address = self.get_operand_value(operand)
+        segment, slot = self.memory.locate_address(address)
+        if segment == LOCAL_SEGMENT or segment == TEMPORAL_SEGMENT:
+            return (FRAME, self.linker.resolve_frame_slot(self.current_function, address))
+        else:
+            return (segment, slot)
+
+    def get_operand_value(self, operand):
+        """Returns the value of a linked operand"""
+        segment, slot = operand
+        if segment == FRAME:
+            return self.call_stack[self.frame_pointer + slot]
+        elif segment == INDIRECT:
+            # The slot is an operand whose value is the address of the value
+            return self.get_operand_value(self.resolve_indirect_operand(slot))
+        else:
+            return self.segment_values[segment][slot]
+
+    def set_operand_value(self, operand, value):
+        """Edits the value of a linked operand"""
+        segment, slot = operand
+        if segment == FRAME:
+            self.call_stack[self.frame_pointer + slot] = value
+        elif segment == INDIRECT:
+            # The slot is an operand whose value is the address to edit
+            self.set_operand_value(self.resolve_indirect_operand(slot), value)
+        else:
+            self.segment_values[segment][slot] = value
+
+    def is_memoized(self, function):
+        """Checks if the results of the calls to a function are cached"""
+        return self.memoize and function['name'] in self.memoized_functions
+
+    def get_call_key(self, function, arguments):
+        """Returns the key the result of a call is cached with, the type of
+        every argument is part of it because a float variable can hold an
+        integer and 1 and 1.0 are equal keys"""
+        return (function['name'],) + tuple((type(argument), argument) for argument in arguments)
+
+    def get_frame_arguments(self, function, frame_start):
+        """Returns the arguments a frame created for a call received"""
+        parameter_slots = self.memoized_functions[function['name']][0]
+        return [self.call_stack[frame_start + slot] for slot in parameter_slots]
+
+    def check_memo_cache(self, key):
+        """Checks if the result of a call is cached, it becomes the most
+        recently used result"""
+        if key in self.memo_cache:
+            self.memo_cache.move_to_end(key)
+            self.memo_hits += 1
+            return True
+        else:
+            self.memo_misses += 1
+            return False
+
+    def add_to_memo_cache(self, key, value):
+        """Caches the result of a call, the least recently used result is
+        dropped when the cache is full"""
+        self.memo_cache[key] = value
+        if len(self.memo_cache) > self.memo_cache_size:
+            self.memo_cache.popitem(last=False)
+
+    def get_return_operand(self, function):
+        """Returns the linked address a pure function returns its result in"""
+        return self.memoized_functions[function['name']][1]
+
     def execute(self, print_step_by_step):
         """Executes the instrucions"""
-        function_called = {} # Stores the function information when one is called
-        actual_parameter = 0 # The parameter position of a function
-        current_memory = self.memory # Global and constant segments never change
-        local_segment_pointer_list = [] # Changes when a function is called
-        temporal_segment_pointer_list = [] # Changes when a function is called
-        # The instruction number we are returning after executing a funtion
-        instruction_number_to_back_list = []
-
-        # Executes for each quadruple
+        instructions = self.instructions
+        dispatch_table = self.dispatch_table
+
+        # Executes for each instruction
         while self.number_of_current_instruction < self.number_of_instructions:
-            current_instruction = self.instructions[self.number_of_current_instruction]
+            opcode, left_operand_address, right_operand_address, result_address = (
+                instructions[self.number_of_current_instruction])
 
             if print_step_by_step == 'Y':
-                print(current_instruction)
-
-            # Obtains the type of action, the addresses of the operands
-            # and where the result will be stored
-            instruction_action = current_instruction.operator
-            left_operand_address = current_instruction.left_operand
-            right_operand_address = current_instruction.right_operand
-            result_address = current_instruction.result
-
-            # Gets value inside the address that is inside the address the
-            # dictionary stores, these operands are the result  of dimensioned
-            # variables calls
-            if isinstance(left_operand_address, dict):
-                left_operand_address = current_memory.get_value(
-                    left_operand_address['index_address'])
-            if isinstance(right_operand_address, dict):
-                right_operand_address = current_memory.get_value(
-                    right_operand_address['index_address'])
-            if isinstance(result_address, dict):
-                result_address = current_memory.get_value(
-                    result_address['index_address'])
-
-            # print(left_operand_address)
-            # print(right_operand_address)
-            # print(result_address)
-
-            # Acts like a switch, differents actions, different instructions
-            if instruction_action == '+':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand + right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '-':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand - right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '*':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand * right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '/':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-
-                if right_operand == 0:
-                    print("ERROR: Divisions by 0 are not allowed")
-                    sys.exit()
-                else:
-                    # Exact division if a float is involved
-                    if isinstance(left_operand, float) or isinstance(right_operand, float):
-                        result = left_operand / right_operand
-                    else:
-                        result = int(left_operand / right_operand)
-
-                    # Stores the result and pass to the next quadruple
-                    current_memory.edit_value(result_address, result)
-                    self.number_of_current_instruction += 1
-            elif instruction_action == '=':
-                left_operand = current_memory.get_value(left_operand_address)
-                result = left_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '>':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand > right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '<':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand < right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '>=':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand >= right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '<=':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand <= right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '==':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand == right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == '!=':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand != right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'and':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand and right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'or':
-                left_operand = current_memory.get_value(left_operand_address)
-                right_operand = current_memory.get_value(right_operand_address)
-                result = left_operand or right_operand
-
-                # Stores the result and pass to the next quadruple
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'PRINT':
-                left_operand = current_memory.get_value(left_operand_address)
-
-                print(str(left_operand))
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'READ':
-                variable_type = left_operand_address
-                message = current_memory.get_value(right_operand_address)
-
-                input_value = input(str(message) + "\n")
-                input_value_type = self.get_string_input_type(input_value)
-                input_value = self.set_input_type(input_value)
-
-                # Assigns only if the types of the input and the variable match
-                if input_value_type == variable_type:
-                    current_memory.edit_value(result_address, input_value)
-                else:
-                    print("Input type mismatch")
-                    sys.exit()
-
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'GOTO':
-                # Points to a new quadruple
-                self.number_of_current_instruction = result_address - 1
-            elif instruction_action == 'GOTOF':
-                left_operand = current_memory.get_value(left_operand_address)
-
-                if not left_operand:
-                    self.number_of_current_instruction = result_address - 1
-                else:
-                    self.number_of_current_instruction += 1
-            elif instruction_action == 'VERF_INDEX':
-                index = current_memory.get_value(left_operand_address)
-                lower_limit = right_operand_address
-                upper_limit = result_address
-
-                if index >= lower_limit and index < upper_limit:
-                    self.number_of_current_instruction += 1
-                else:
-                    print("Index out of bound")
-                    sys.exit()
-            elif instruction_action == 'RETURN':
-                left_operand = current_memory.get_value(left_operand_address)
-                result = left_operand
-
-                current_memory.edit_value(result_address, result)
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'ERA':
-                # Gets the information of the function called and creates it a
-                # memory to store its local and temporal variables
-                function_called['function'] = self.function_directory.get_function(left_operand_address)
-                function_called['memory'] = Memory()
-                actual_parameter = 0
-
-                # Asks to allocate the number of local and temporaral variables
-                # the function has
-                self.request_local_addresses(function_called)
-                self.request_temporal_addresses(function_called)
-
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'PARAMETER':
-                # Gets the value of the parameter and the address where will
-                # be stored and increments the position of the parameter called
-                left_operand = current_memory.get_value(left_operand_address)
-                parameter_adress = function_called['function']['parameters']['addresses'][actual_parameter]
-                actual_parameter += 1
-
-                # Stores the value of the parameter in its corresponding function
-                # segment menory
-                function_called['memory'].edit_value(parameter_adress, left_operand)
-
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'GOSUB':
-                # Stores the number of instruction we will return after the function
-                # execution ends
-                instruction_number_to_back_list.append(self.number_of_current_instruction)
-
-                # Stores the local and temporal memory segments of the function
-                # that is making the call
-                local_segment_pointer_list.append(current_memory.local_memory)
-                temporal_segment_pointer_list.append(current_memory.temporal_memory)
-
-                # Change the local and temporal memory segments for the ones the
-                # function that will be executed has
-                current_memory.local_memory = function_called['memory'].local_memory
-                current_memory.temporal_memory = function_called['memory'].temporal_memory
-
-                # Points where the function called starts
-                self.number_of_current_instruction = result_address - 1
-            elif instruction_action == 'ENDPROC':
-                # Destroys the local information of the function when it ends
-                # and returns to the local and temporal segments of the function caller
-                function_called.clear()
-                current_memory.local_memory = local_segment_pointer_list.pop()
-                current_memory.temporal_memory = temporal_segment_pointer_list.pop()
-
-                # Returns to the next instruction of the function caller
-                self.number_of_current_instruction = instruction_number_to_back_list.pop() + 1
-            elif instruction_action == 'CREATE_TURTLE':
-                # Initialices a new turtle
-                current_turtle = turtle.Turtle()
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'RESET':
-                # Erases the drawings of current turtle and places it at start
-                current_turtle.reset()
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'FINISH_DRAWING':
-                # Stops the graphical output window from interaction
-                turtle.done()
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'PEN_UP':
-                # Stops the current turtle from drawing when moving
-                current_turtle.penup()
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'PEN_DOWN':
-                # Restarts the current turtle from drawing when moving
-                current_turtle.pendown()
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'BEGIN_FILL':
-                #Indicates that next drawings will be filled with fillcolor
-                current_turtle.begin_fill()
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'END_FILL':
-                #Previous drawings are filled with the current fillcolor
-                current_turtle.end_fill()
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'PEN_COLOR':
-                # Sets the current color of the pen
-                left_operand = current_memory.get_value(left_operand_address)
-                color_name = left_operand
-                color_name = color_name[1:-1]
-                current_turtle.pencolor(color_name)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'FILL_COLOR':
-                # Sets the current color of the filling
-                left_operand = current_memory.get_value(left_operand_address)
-                color_name = left_operand
-                color_name = color_name[1:-1]
-                current_turtle.fillcolor(color_name)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'PEN_WIDTH':
-                # Sets the width of the pen
-                left_operand = current_memory.get_value(left_operand_address)
-                current_turtle.width(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'MOVE_FORWARD':
-                # Get the distance to move forward to
-                left_operand = int(current_memory.get_value(left_operand_address))
-                # Moves the turtle forward the distance of left_operand
-                current_turtle.forward(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'MOVE_RIGHT':
-                # Get the distance to move
-                left_operand = current_memory.get_value(left_operand_address)
-                # Turns turtle 90 degrees to the right
-                current_turtle.right(90)
-                # Moves the turtle forward the distance of left_operand
-                current_turtle.forward(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'MOVE_LEFT':
-                # Get the distance to move
-                left_operand = current_memory.get_value(left_operand_address)
-                # Turns turtle 90 degrees to the left
-                current_turtle.left(90)
-                # Moves the turtle forward the distance of left_operand
-                current_turtle.forward(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'TURN_RIGHT':
-                # Get the degrees to turn right
-                left_operand = current_memory.get_value(left_operand_address)
-                # Turns turtle certain left_operand degrees to the right
-                current_turtle.right(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'TURN_LEFT':
-                # Get the degrees to turn left
-                left_operand = current_memory.get_value(left_operand_address)
-                # Turns turtle certain left_operand degrees to the left
-                current_turtle.left(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'DRAW_SQUARE':
-                # Get the size of the sides of the square
-                left_operand = current_memory.get_value(left_operand_address)
-                # Draws a square
-                current_turtle.forward(left_operand)
-                current_turtle.right(90)
-                current_turtle.forward(left_operand)
-                current_turtle.right(90)
-                current_turtle.forward(left_operand)
-                current_turtle.right(90)
-                current_turtle.forward(left_operand)
-                current_turtle.right(90)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'DRAW_TRIANGLE':
-                # Get the size of the sides of the triangle
-                left_operand = current_memory.get_value(left_operand_address)
-                # Draws an equilateral triangle
-                current_turtle.forward(left_operand)
-                current_turtle.left(120)
-                current_turtle.forward(left_operand)
-                current_turtle.left(120)
-                current_turtle.forward(left_operand)
-                current_turtle.left(120)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'DRAW_CIRCLE':
-                # Get the radius of the circle
-                left_operand = current_memory.get_value(left_operand_address)
-                # Draws an equilateral triangle
-                current_turtle.circle(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'DRAW_RECTANGLE':
-                # Get the size of the upper and bottom side of the rectangle
-                left_operand = current_memory.get_value(left_operand_address)
-                # Get the size of the left and right side of the rectangle
-                right_operand = current_memory.get_value(right_operand_address)
-                # Draws a rectangle
-                current_turtle.forward(left_operand)
-                current_turtle.right(90)
-                current_turtle.forward(right_operand)
-                current_turtle.right(90)
-                current_turtle.forward(left_operand)
-                current_turtle.right(90)
-                current_turtle.forward(right_operand)
-                current_turtle.right(90)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'SET_POSITION':
-                # Get the position in X axis
-                left_operand = current_memory.get_value(left_operand_address)
-                # Get the position in Y axis
-                right_operand = current_memory.get_value(right_operand_address)
-                # Set position of turtle
-                current_turtle.setposition(left_operand, right_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
-            elif instruction_action == 'SET_SPEED':
-                # Get the speed rate number
-                left_operand = current_memory.get_value(left_operand_address)
-                # Set turtle speed rate
-                current_turtle.speed(left_operand)
-                # Pass to the next quadruple
-                self.number_of_current_instruction += 1
+                print(self.quadruples[self.number_of_current_instruction])
+
+            # The opcode selects the method that executes the instruction, it
+            # returns the number of the next instruction only when it jumps
+            next_instruction = dispatch_table[opcode](left_operand_address,
+                right_operand_address, result_address)
+
+            if next_instruction is None:
+                self.number_of_current_instruction += 1
+            else:
+                self.number_of_current_instruction = next_instruction
+
+    def execute_addition(self, left_operand_address, right_operand_address, result_address):
+        """Adds two operands and stores the result"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand + right_operand)
+
+    def execute_subtraction(self, left_operand_address, right_operand_address, result_address):
+        """Subtracts two operands and stores the result"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand - right_operand)
+
+    def execute_multiplication(self, left_operand_address, right_operand_address, result_address):
+        """Multiplies two operands and stores the result"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand * right_operand)
+
+    def execute_division(self, left_operand_address, right_operand_address, result_address):
+        """Divides two operands and stores the result"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+
+        if right_operand == 0:
+            print("ERROR: Divisions by 0 are not allowed")
+            sys.exit()
+        else:
+            # Exact division if a float is involved
+            if isinstance(left_operand, float) or isinstance(right_operand, float):
+                result = left_operand / right_operand
+            else:
+                result = int(left_operand / right_operand)
+
+            self.set_operand_value(result_address, result)
+
+    def execute_assignment(self, left_operand_address, right_operand_address, result_address):
+        """Copies the value of an operand"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.set_operand_value(result_address, left_operand)
+
+    def execute_greater_than(self, left_operand_address, right_operand_address, result_address):
+        """Compares if an operand is greater than the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand > right_operand)
+
+    def execute_less_than(self, left_operand_address, right_operand_address, result_address):
+        """Compares if an operand is less than the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand < right_operand)
+
+    def execute_greater_equal(self, left_operand_address, right_operand_address, result_address):
+        """Compares if an operand is greater than or equal to the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand >= right_operand)
+
+    def execute_less_equal(self, left_operand_address, right_operand_address, result_address):
+        """Compares if an operand is less than or equal to the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand <= right_operand)
+
+    def execute_equal(self, left_operand_address, right_operand_address, result_address):
+        """Compares if two operands are equal"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand == right_operand)
+
+    def execute_not_equal(self, left_operand_address, right_operand_address, result_address):
+        """Compares if two operands are different"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand != right_operand)
+
+    def execute_and(self, left_operand_address, right_operand_address, result_address):
+        """Solves the logical and of two operands"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand and right_operand)
+
+    def execute_or(self, left_operand_address, right_operand_address, result_address):
+        """Solves the logical or of two operands"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.set_operand_value(result_address, left_operand or right_operand)
+
+    def execute_print(self, left_operand_address, right_operand_address, result_address):
+        """Prints the value of an operand"""
+        left_operand = self.get_operand_value(left_operand_address)
+        print(str(left_operand))
+
+    def execute_read(self, left_operand_address, right_operand_address, result_address):
+        """Reads a value from the user and stores it"""
+        variable_type = left_operand_address
+        message = self.get_operand_value(right_operand_address)
+
+        input_value = input(str(message) + "\n")
+        input_value_type = self.get_string_input_type(input_value)
+        input_value = self.set_input_type(input_value)
+
+        # Assigns only if the types of the input and the variable match
+        if input_value_type == variable_type:
+            self.set_operand_value(result_address, input_value)
+        else:
+            print("Input type mismatch")
+            sys.exit()
+
+    def execute_goto(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction"""
+        return result_address
+
+    def execute_gotof(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when the operand is false"""
+        left_operand = self.get_operand_value(left_operand_address)
+
+        if not left_operand:
+            return result_address
+
+    def execute_gotot(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when the operand is true"""
+        left_operand = self.get_operand_value(left_operand_address)
+
+        if left_operand:
+            return result_address
+
+    def execute_gotof_greater_than(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when an operand is not greater than the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+
+        if not left_operand > right_operand:
+            return result_address
+
+    def execute_gotof_less_than(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when an operand is not less than the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+
+        if not left_operand < right_operand:
+            return result_address
+
+    def execute_gotof_greater_equal(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when an operand is not greater than or equal to the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+
+        if not left_operand >= right_operand:
+            return result_address
+
+    def execute_gotof_less_equal(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when an operand is not less than or equal to the other"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+
+        if not left_operand <= right_operand:
+            return result_address
+
+    def execute_gotof_equal(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when two operands are not equal"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+
+        if not left_operand == right_operand:
+            return result_address
+
+    def execute_gotof_not_equal(self, left_operand_address, right_operand_address, result_address):
+        """Points to a new instruction when two operands are not different"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+
+        if not left_operand != right_operand:
+            return result_address
+
+    def execute_verify_index(self, left_operand_address, right_operand_address, result_address):
+        """Verifies the index of a dimensioned variable is inside its boundaries"""
+        index = self.get_operand_value(left_operand_address)
+        lower_limit = right_operand_address
+        upper_limit = result_address
+
+        if not (index >= lower_limit and index < upper_limit):
+            print("Index out of bound")
+            sys.exit()
+
+    def execute_return(self, left_operand_address, right_operand_address, result_address):
+        """Stores the value a function returns"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.set_operand_value(result_address, left_operand)
+
+    def execute_era(self, left_operand_address, right_operand_address, result_address):
+        """Creates the frame of the function that will be called"""
+        # The frame is placed at the top of the call stack with the values
+        # the local and temporal variables of the function start with
+        self.called_frame_list.append(len(self.call_stack))
+        self.call_stack.extend(left_operand_address['frame_values'])
+
+    def execute_parameter(self, left_operand_address, right_operand_address, result_address):
+        """Passes an argument to the function that will be called"""
+        # Gets the value of the parameter, the linker resolved the result to
+        # the position of the parameter in the frame of the function
+        left_operand = self.get_operand_value(left_operand_address)
+        self.call_stack[self.called_frame_list[-1] + result_address] = left_operand
+
+    def execute_gosub(self, left_operand_address, right_operand_address, result_address):
+        """Starts the execution of the function called"""
+        key = None
+        if self.is_memoized(left_operand_address):
+            key = self.get_call_key(left_operand_address, self.get_frame_arguments(
+                left_operand_address, self.called_frame_list[-1]))
+            if self.check_memo_cache(key):
+                # The cached result is returned without executing the function,
+                # the frame created for the call is dropped
+                del self.call_stack[self.called_frame_list.pop():]
+                self.set_operand_value(self.get_return_operand(left_operand_address),
+                    self.memo_cache[key])
+                return None
+
+        # Stores the number of instruction we will return after the function
+        # execution ends and the frame of the function that is making the call
+        self.return_list.append((self.number_of_current_instruction,
+            self.frame_pointer, self.current_function, key))
+
+        # The frame of the function called becomes the current one
+        self.frame_pointer = self.called_frame_list.pop()
+        self.current_function = left_operand_address
+
+        # Points where the function called starts
+        return result_address
+
+    def execute_endproc(self, left_operand_address, right_operand_address, result_address):
+        """Ends the execution of a function and returns to its caller"""
+        # Destroys the frame of the function when it ends and returns to the
+        # frame of the function caller
+        del self.call_stack[self.frame_pointer:]
+        returned_function = self.current_function
+        instruction_number, self.frame_pointer, self.current_function, key = self.return_list.pop()
+        if key is not None:
+            self.add_to_memo_cache(key, self.get_operand_value(
+                self.get_return_operand(returned_function)))
+
+        # Returns to the next instruction of the function caller
+        return instruction_number + 1
+
+    def execute_create_turtle(self, left_operand_address, right_operand_address, result_address):
+        """Initialices a new turtle"""
+        self.current_turtle = turtle.Turtle()
+
+    def execute_reset(self, left_operand_address, right_operand_address, result_address):
+        """Erases the drawings of current turtle and places it at start"""
+        self.current_turtle.reset()
+
+    def execute_finish_drawing(self, left_operand_address, right_operand_address, result_address):
+        """Stops the graphical output window from interaction"""
+        turtle.done()
+
+    def execute_pen_up(self, left_operand_address, right_operand_address, result_address):
+        """Stops the current turtle from drawing when moving"""
+        self.current_turtle.penup()
+
+    def execute_pen_down(self, left_operand_address, right_operand_address, result_address):
+        """Restarts the current turtle from drawing when moving"""
+        self.current_turtle.pendown()
+
+    def execute_begin_fill(self, left_operand_address, right_operand_address, result_address):
+        """Indicates that next drawings will be filled with fillcolor"""
+        self.current_turtle.begin_fill()
+
+    def execute_end_fill(self, left_operand_address, right_operand_address, result_address):
+        """Previous drawings are filled with the current fillcolor"""
+        self.current_turtle.end_fill()
+
+    def execute_pen_color(self, left_operand_address, right_operand_address, result_address):
+        """Sets the current color of the pen"""
+        color_name = self.get_operand_value(left_operand_address)
+        color_name = color_name[1:-1]
+        self.current_turtle.pencolor(color_name)
+
+    def execute_fill_color(self, left_operand_address, right_operand_address, result_address):
+        """Sets the current color of the filling"""
+        color_name = self.get_operand_value(left_operand_address)
+        color_name = color_name[1:-1]
+        self.current_turtle.fillcolor(color_name)
+
+    def execute_pen_width(self, left_operand_address, right_operand_address, result_address):
+        """Sets the width of the pen"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.current_turtle.width(left_operand)
+
+    def execute_move_forward(self, left_operand_address, right_operand_address, result_address):
+        """Moves the turtle forward the distance of the operand"""
+        left_operand = int(self.get_operand_value(left_operand_address))
+        self.current_turtle.forward(left_operand)
+
+    def execute_move_right(self, left_operand_address, right_operand_address, result_address):
+        """Turns turtle 90 degrees to the right and moves it the distance of the operand"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.current_turtle.right(90)
+        self.current_turtle.forward(left_operand)
+
+    def execute_move_left(self, left_operand_address, right_operand_address, result_address):
+        """Turns turtle 90 degrees to the left and moves it the distance of the operand"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.current_turtle.left(90)
+        self.current_turtle.forward(left_operand)
+
+    def execute_turn_right(self, left_operand_address, right_operand_address, result_address):
+        """Turns turtle certain degrees to the right"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.current_turtle.right(left_operand)
+
+    def execute_turn_left(self, left_operand_address, right_operand_address, result_address):
+        """Turns turtle certain degrees to the left"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.current_turtle.left(left_operand)
+
+    def execute_draw_square(self, left_operand_address, right_operand_address, result_address):
+        """Draws a square with the size of the operand"""
+        left_operand = self.get_operand_value(left_operand_address)
+        for side in range(4):
+            self.current_turtle.forward(left_operand)
+            self.current_turtle.right(90)
+
+    def execute_draw_triangle(self, left_operand_address, right_operand_address, result_address):
+        """Draws an equilateral triangle with the size of the operand"""
+        left_operand = self.get_operand_value(left_operand_address)
+        for side in range(3):
+            self.current_turtle.forward(left_operand)
+            self.current_turtle.left(120)
+
+    def execute_draw_circle(self, left_operand_address, right_operand_address, result_address):
+        """Draws a circle with the radius of the operand"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.current_turtle.circle(left_operand)
+
+    def execute_draw_rectangle(self, left_operand_address, right_operand_address, result_address):
+        """Draws a rectangle, its width is the left operand and its height the right one"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        for side in range(2):
+            self.current_turtle.forward(left_operand)
+            self.current_turtle.right(90)
+            self.current_turtle.forward(right_operand)
+            self.current_turtle.right(90)
+
+    def execute_set_position(self, left_operand_address, right_operand_address, result_address):
+        """Sets the position of the turtle in the X and Y axis"""
+        left_operand = self.get_operand_value(left_operand_address)
+        right_operand = self.get_operand_value(right_operand_address)
+        self.current_turtle.setposition(left_operand, right_operand)
+
+    def execute_set_speed(self, left_operand_address, right_operand_address, result_address):
+        """Sets the turtle speed rate"""
+        left_operand = self.get_operand_value(left_operand_address)
+        self.current_turtle.speed(left_operand)
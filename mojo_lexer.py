@@ -4,7 +4,11 @@
 # A simple lexer for the mojo language.
 # -----------------------------------------------------------------------------
 
-import ply.lex as lex
+import os
+import sys
+import threading
+
+from helpers.lexer_cache import LexerCache
 
 # Reserved words
 reserved = {
@@ -130,13 +134,20 @@ def t_error(t):
     print("Illegal character '%s'" % t.value[0])
     t.lexer.skip(1)
 
-# Runs lex
-mojo_lexer = lex.lex()
-input_data = ''
-mojo_lexer.input(input_data)
+# Tables of the lexer, cached next to this file
+lexer_cache = LexerCache(sys.modules[__name__], os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), '__mojocache__'))
+
+# Lexer the lexers of the compilations are cloned from, the first call to
+# make_lexer builds it
+master_lexer = None
+master_lexer_lock = threading.Lock()
 
-while True:
-    token = mojo_lexer.token()
-    if not token:
-        break
-    print(token)
+def make_lexer():
+    """Returns a new lexer of the language, the first call builds it from the
+    cached tables and the next ones clone it"""
+    global master_lexer
+    with master_lexer_lock:
+        if master_lexer is None:
+            master_lexer = lexer_cache.build_lexer()
+    return master_lexer.clone()